@@ -0,0 +1,142 @@
+import math
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+
+
+class ConvexPiecewiseLinearFunction(PiecewiseLinearFunction):
+    """
+    Represents a convex Piecewise Linear Function
+
+    A convex piecewise linear function is a continuous piecewise linear function whose slopes are non-decreasing. The
+    sorted slopes give a O(log n) minimum and let the conjugate and the infimal convolution be computed in linear time.
+    """
+
+    def __init__(
+        self, breakpoints: List[float], slopes: List[float], intercepts: List[float]
+    ) -> None:
+        """
+        Takes the same arguments as PiecewiseLinearFunction.
+
+        Raises: ValueError if the input is not valid for a PiecewiseLinearFunction or if the function is not convex
+        """
+        super().__init__(breakpoints, slopes, intercepts)
+        if not self.is_convex():
+            raise ValueError(
+                "ConvexPiecewiseLinearFunction expects continuous pieces with non-decreasing slopes"
+            )
+
+    def minimum(self) -> Tuple[float, float]:
+        """
+        Returns (min_value: float, arg_min: float): the minimum is reached at the left end of the first piece with a
+        non-negative slope, found by binary search over the slopes.
+        """
+        k = bisect_left(self.slopes, 0)
+        if k == len(self.slopes):
+            # Decreasing over the whole domain, the minimum is at its right end
+            return self._minimum_between(k - 1, k)
+        return self._minimum_between(k, k + 1)
+
+    def maximum(self) -> Tuple[float, float]:
+        """
+        Returns (max_value: float, arg_max: float): the maximum of a convex function is reached at one of the ends of
+        its domain of definition.
+        """
+        n = len(self.slopes)
+        left = self._maximum_between(0, 1)
+        right = self._maximum_between(n - 1, n)
+        return right if right[0] > left[0] else left
+
+    def conjugate(self) -> "ConvexPiecewiseLinearFunction":
+        """
+        Legendre–Fenchel conjugate `f*(s) = sup_x (s x - f(x))` of the function.
+
+        The supremum for a slope s between the slopes of two consecutive pieces is reached at their shared breakpoint
+        x_i, so that f* is linear of slope x_i and intercept -f(x_i) between these slopes: the breakpoints of f* are
+        the slopes of f and its slopes are the breakpoints of f. Outside the range of slopes of f, f* is linear if the
+        domain of f is bounded on that side and infinite otherwise, in which case it is left out of the domain of f*.
+
+        Returns: the conjugate, computed in O(n)
+
+        Raises: ValueError if the domain of the conjugate is reduced to a single point, i.e., the function is linear
+        over the whole real line
+        """
+        xs, slopes, intercepts = self.breakpoints, self.slopes, self.intercepts
+        n = len(slopes)
+        conjugate_breakpoints: List[float] = []
+        conjugate_slopes: List[float] = []
+        conjugate_intercepts: List[float] = []
+        if math.isfinite(xs[0]):
+            conjugate_breakpoints.append(-math.inf)
+            conjugate_slopes.append(xs[0])
+            conjugate_intercepts.append(-(slopes[0] * xs[0] + intercepts[0]))
+        conjugate_breakpoints.append(slopes[0])
+        for i in range(1, n):
+            if slopes[i] == slopes[i - 1]:
+                continue
+            conjugate_slopes.append(xs[i])
+            conjugate_intercepts.append(-(slopes[i] * xs[i] + intercepts[i]))
+            conjugate_breakpoints.append(slopes[i])
+        if math.isfinite(xs[n]):
+            conjugate_slopes.append(xs[n])
+            conjugate_intercepts.append(-(slopes[n - 1] * xs[n] + intercepts[n - 1]))
+            conjugate_breakpoints.append(math.inf)
+        if len(conjugate_breakpoints) < 2:
+            raise ValueError(
+                "ConvexPiecewiseLinearFunction conjugate is only defined at a single point"
+            )
+        return ConvexPiecewiseLinearFunction._unchecked(
+            conjugate_breakpoints, conjugate_slopes, conjugate_intercepts
+        )
+
+    def infimal_convolution(
+        self, other: "ConvexPiecewiseLinearFunction"
+    ) -> "ConvexPiecewiseLinearFunction":
+        """
+        Infimal (min-plus) convolution `(f □ g)(z) = inf_{x + y = z} f(x) + g(y)` of two convex functions.
+
+        The infimal convolution is the conjugate of the sum of the conjugates. As the breakpoints of the conjugates
+        are the slopes of the functions, summing them merges the two sorted slope sequences in O(n + m), and the pieces
+        of the result are the pieces of both functions sorted by slope.
+
+        Args:
+            other (ConvexPiecewiseLinearFunction): the function to convolve with
+
+        Returns: the infimal convolution, computed in O(n + m)
+
+        Raises: ValueError if the infimal convolution is not bounded below, i.e., the slopes of the functions towards
+        their infinite ends do not overlap
+        """
+        return _add(self.conjugate(), other.conjugate()).conjugate()
+
+
+def _add(
+    f: ConvexPiecewiseLinearFunction, g: ConvexPiecewiseLinearFunction
+) -> ConvexPiecewiseLinearFunction:
+    """
+    Sum of two convex functions over the intersection of their domains, merging their breakpoints in O(n + m).
+
+    Raises: ValueError if the intersection of the domains has less than two points
+    """
+    start = max(f.breakpoints[0], g.breakpoints[0])
+    end = min(f.breakpoints[-1], g.breakpoints[-1])
+    if start >= end:
+        raise ValueError(
+            "ConvexPiecewiseLinearFunction sum expects overlapping domains of definition"
+        )
+    i = bisect_right(f.breakpoints, start) - 1
+    j = bisect_right(g.breakpoints, start) - 1
+    breakpoints = [start]
+    slopes: List[float] = []
+    intercepts: List[float] = []
+    while breakpoints[-1] < end:
+        following = min(f.breakpoints[i + 1], g.breakpoints[j + 1], end)
+        slopes.append(f.slopes[i] + g.slopes[j])
+        intercepts.append(f.intercepts[i] + g.intercepts[j])
+        breakpoints.append(following)
+        if f.breakpoints[i + 1] == following:
+            i += 1
+        if g.breakpoints[j + 1] == following:
+            j += 1
+    return ConvexPiecewiseLinearFunction._unchecked(breakpoints, slopes, intercepts)
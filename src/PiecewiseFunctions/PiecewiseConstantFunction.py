@@ -1,6 +1,16 @@
-from typing import List, Tuple, Any
+from bisect import bisect_right
+from typing import TYPE_CHECKING, List, Tuple, Any, Optional
 
-from PiecewiseFunctions.PiecewiseFunction import PiecewiseFunction
+from PiecewiseFunctions.PiecewiseFunction import (
+    VECTORIZE_THRESHOLD,
+    PiecewiseFunction,
+    np,
+)
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+from PiecewiseFunctions.rolling import rolling_extremum, rolling_mean
+
+if TYPE_CHECKING:
+    import numpy
 
 
 class PiecewiseConstantFunction(PiecewiseFunction):
@@ -41,6 +51,18 @@ class PiecewiseConstantFunction(PiecewiseFunction):
         self.breakpoints = breakpoints
         self.values = values
 
+    @classmethod
+    def _unchecked(
+        cls, breakpoints: List[float], values: List[float]
+    ) -> "PiecewiseConstantFunction":
+        """
+        Build a function from inputs known to be valid, e.g. computed from other functions, skipping `sanity_check`.
+        """
+        fn = cls.__new__(cls)
+        fn.breakpoints = breakpoints
+        fn.values = values
+        return fn
+
     @staticmethod
     def sanity_check(breakpoints: Any, values: Any) -> None:
         """
@@ -129,6 +151,73 @@ class PiecewiseConstantFunction(PiecewiseFunction):
                 return self.values[i]
         raise ValueError(f"No interval found for input value {x}.")
 
+    def evaluate_many(self, xs: List[float]) -> List[float]:
+        """
+        Evaluate the function on a batch of points.
+
+        Each point is located with a binary search over the breakpoints, so evaluating m points costs O(m log n)
+        instead of the O(m n) of calling `evaluate` in a loop. When numpy is available, batches of at least
+        VECTORIZE_THRESHOLD points are located with a single vectorized search.
+
+        Args:
+            xs: (List[float]) the arguments to evaluate the function on.
+
+        Raises:
+            ValueError: If any of the points is outside the domain of the function.
+
+        Returns:
+            The list of the values of the function, in the same order as `xs`.
+        """
+        if np is not None and len(xs) >= VECTORIZE_THRESHOLD:
+            _, indices = self._locate_many(xs)
+            return self._array("values")[indices].tolist()
+        breakpoints = self.breakpoints
+        lower, upper = breakpoints[0], breakpoints[-1]
+        results = []
+        for x in xs:
+            if not lower <= x < upper:
+                raise ValueError(f"Input value {x} is out of bounds.")
+            results.append(self.values[bisect_right(breakpoints, x) - 1])
+        return results
+
+    def evaluate_with_gradient(
+        self, xs: List[float], side: str = "right"
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Evaluate the function and its gradient on a batch of points, locating all the points with a single vectorized
+        search. Requires numpy.
+
+        The gradient of a piecewise constant function is null wherever it is defined, it is not defined at the jumps
+        of the function, see `jumps`.
+
+        Args:
+            xs: (List[float]) the arguments to evaluate the function on.
+            side: (str) "left" or "right" for null gradients, "interval" for null (lowest, highest) pairs, matching
+                PiecewiseLinearFunction.evaluate_with_gradient
+
+        Raises:
+            ValueError: If any of the points is outside the domain of the function or if side is not valid.
+
+        Returns:
+            (values, gradients, indices) arrays where indices are the indices of the intervals on which the points lie
+        """
+        self._require_numpy("evaluate_with_gradient")
+        if side not in ("left", "right", "interval"):
+            raise ValueError(f"Side {side} should be one of left, right or interval.")
+        _, indices = self._locate_many(xs)
+        shape = (len(indices), 2) if side == "interval" else len(indices)
+        return self._array("values")[indices], np.zeros(shape), indices
+
+    def jumps(self) -> List[float]:
+        """
+        Returns: the inner breakpoints where the value of the function changes, where its gradient is not defined
+        """
+        return [
+            self.breakpoints[i + 1]
+            for i in range(len(self.values) - 1)
+            if self.values[i] != self.values[i + 1]
+        ]
+
     def minimum(self) -> Tuple[float, float]:
         """
         Returns: ((min value, arg min)) the minimum value of the function and the corresponding argmin, i.e., the left endpoint
@@ -137,15 +226,127 @@ class PiecewiseConstantFunction(PiecewiseFunction):
         Notes: The maximum method works analogously.
 
         """
-        min_val = min(self.values)
-        argmin = self.breakpoints[self.values.index(min_val)]
-        return min_val, argmin
+        return self._minimum_between(0, len(self.values))
 
     def maximum(self) -> Tuple[float, float]:
         """
         Analogs to minimum implementation
         Returns: (max value, arg max)
         """
-        max_val = max(self.values)
-        argmax = self.breakpoints[self.values.index(max_val)]
-        return max_val, argmax
+        return self._maximum_between(0, len(self.values))
+
+    def _minimum_between(self, start: int, stop: int) -> Tuple[float, float]:
+        """
+        Returns: (min value, arg min) over the intervals of index start (included) to stop (excluded)
+        """
+        values = self.values[start:stop]
+        min_val = min(values)
+        return min_val, self.breakpoints[start + values.index(min_val)]
+
+    def _maximum_between(self, start: int, stop: int) -> Tuple[float, float]:
+        """
+        Returns: (max value, arg max) over the intervals of index start (included) to stop (excluded)
+        """
+        values = self.values[start:stop]
+        max_val = max(values)
+        return max_val, self.breakpoints[start + values.index(max_val)]
+
+    def integrate(self, x_min: float, x_max: float) -> float:
+        """
+        Integral of the function over [x_min, x_max].
+
+        Args:
+            x_min: lower bound of the integration interval
+            x_max: upper bound of the integration interval
+
+        Raises: ValueError if x_min > x_max or if the interval is not included in the domain of the function
+
+        Returns: the sum, over each interval overlapping [x_min, x_max], of its value times the length of the overlap
+        """
+        if x_min > x_max:
+            raise ValueError(
+                f"Lower bound {x_min} is greater than upper bound {x_max}."
+            )
+        if x_min < self.breakpoints[0] or x_max > self.breakpoints[-1]:
+            raise ValueError(f"Interval [{x_min}, {x_max}] is out of bounds.")
+        if x_min == x_max:
+            return 0.0
+        total = 0.0
+        i = max(bisect_right(self.breakpoints, x_min) - 1, 0)
+        while i < len(self.values) and self.breakpoints[i] < x_max:
+            left = max(self.breakpoints[i], x_min)
+            right = min(self.breakpoints[i + 1], x_max)
+            total += self.values[i] * (right - left)
+            i += 1
+        return total
+
+    def rolling_max(self, width: float) -> "PiecewiseConstantFunction":
+        """
+        Maximum of the function over the trailing window [x - width, x], computed exactly in O(n).
+
+        Args:
+            width: width of the window
+
+        Returns: the rolling maximum, defined from the first breakpoint + width to the last breakpoint
+
+        Raises: ValueError if width is not strictly positive or larger than the domain of the function
+        """
+        breakpoints, _, values = rolling_extremum(
+            self.breakpoints, [0] * len(self.values), self.values, width, 1
+        )
+        return PiecewiseConstantFunction._unchecked(breakpoints, values)
+
+    def rolling_min(self, width: float) -> "PiecewiseConstantFunction":
+        """
+        Analogs to rolling_max implementation
+        Returns: the rolling minimum
+        """
+        breakpoints, _, values = rolling_extremum(
+            self.breakpoints, [0] * len(self.values), self.values, width, -1
+        )
+        return PiecewiseConstantFunction._unchecked(breakpoints, values)
+
+    def rolling_mean(self, width: float) -> PiecewiseLinearFunction:
+        """
+        Mean of the function over the trailing window [x - width, x], computed exactly in O(n).
+
+        The mean is linear between the breakpoints of the function and the breakpoints shifted by width.
+
+        Args:
+            width: width of the window
+
+        Returns: the rolling mean, defined from the first breakpoint + width to the last breakpoint
+
+        Raises: ValueError if width is not strictly positive or larger than the domain of the function
+        """
+        return PiecewiseLinearFunction._unchecked(
+            *rolling_mean(self.breakpoints, [0] * len(self.values), self.values, width)
+        )
+
+    def sample(
+        self, n: int, rng: Optional["numpy.random.Generator"] = None
+    ) -> "numpy.ndarray":
+        """
+        Draw random variates using the function as an unnormalized density.
+
+        The cumulative mass of the function is computed on the first call and reused by the following ones, each call
+        then draws the variates with a vectorized inversion of the cumulative distribution. Requires numpy.
+
+        Warnings: each variate costs a binary search over the pieces, drawing 10^7 variates takes a fraction of a second
+        for densities with a few pieces, but a couple of seconds for densities with 100k pieces.
+
+        Args:
+            n: number of variates to draw
+            rng: numpy random generator, a new default generator when None
+
+        Returns: a numpy array of n variates
+
+        Raises: ValueError if the function is negative somewhere, has an infinite mass or a null total mass
+        """
+        from PiecewiseFunctions.sampling import PiecewiseDensitySampler
+
+        if getattr(self, "_sampler", None) is None:
+            self._sampler = PiecewiseDensitySampler(
+                self.breakpoints, [0] * len(self.values), self.values
+            )
+        return self._sampler.sample(n, rng)
@@ -1,5 +1,20 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Tuple
+from concurrent.futures import Executor
+from typing import Callable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except (
+    ImportError
+):  # numpy is optional, batch evaluations then fall back to pure Python
+    np = None
+
+# Number of points from which batch evaluations use a single vectorized search, when numpy is available
+VECTORIZE_THRESHOLD = 64
+
+# Number of points or intervals processed between two yields to the event loop by the async methods
+ASYNC_CHUNK_SIZE = 10000
 
 
 class PiecewiseFunction(ABC):
@@ -7,6 +22,16 @@ class PiecewiseFunction(ABC):
     def evaluate(self, x: float) -> float:
         pass
 
+    @abstractmethod
+    def evaluate_many(self, xs: List[float]) -> List[float]:
+        pass
+
+    @abstractmethod
+    def evaluate_with_gradient(
+        self, xs: List[float], side: str = "right"
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        pass
+
     @abstractmethod
     def minimum(self) -> Tuple[float, float]:
         pass
@@ -14,3 +39,128 @@ class PiecewiseFunction(ABC):
     @abstractmethod
     def maximum(self) -> Tuple[float, float]:
         pass
+
+    @abstractmethod
+    def integrate(self, x_min: float, x_max: float) -> float:
+        pass
+
+    @abstractmethod
+    def _minimum_between(self, start: int, stop: int) -> Tuple[float, float]:
+        pass
+
+    @abstractmethod
+    def _maximum_between(self, start: int, stop: int) -> Tuple[float, float]:
+        pass
+
+    def _array(self, name: str) -> "np.ndarray":
+        """
+        Returns: the attribute `name` of the function, a list of numbers, as a numpy array cached on the function,
+        as functions are not modified once built
+        """
+        arrays = self.__dict__.setdefault("_arrays", {})
+        if name not in arrays:
+            arrays[name] = np.asarray(getattr(self, name), dtype=float)
+        return arrays[name]
+
+    def _require_numpy(self, method: str) -> None:
+        if np is None:
+            raise ImportError(f"{type(self).__name__}.{method} requires numpy")
+
+    def _locate_many(self, xs: List[float]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Locate a batch of points with a single vectorized binary search over the breakpoints. Requires numpy.
+
+        Returns: (points, indices) the points as an array and the indices of the intervals containing them
+
+        Raises: ValueError if any of the points is out of bounds
+        """
+        points = np.asarray(xs, dtype=float)
+        breakpoints = self._array("breakpoints")
+        in_bounds = (breakpoints[0] <= points) & (points < breakpoints[-1])
+        if not in_bounds.all():
+            raise ValueError(f"x={points[~in_bounds][0]} is out of bounds")
+        return points, np.searchsorted(breakpoints, points, side="right") - 1
+
+    async def aevaluate_many(
+        self,
+        xs: List[float],
+        chunk_size: int = ASYNC_CHUNK_SIZE,
+        executor: Optional[Executor] = None,
+    ) -> List[float]:
+        """
+        Asynchronous counterpart of `evaluate_many` that does not block the event loop on large inputs.
+
+        Inputs of at most `chunk_size` points are evaluated inline. Larger inputs are split in chunks of `chunk_size`
+        points, each chunk is evaluated inline followed by a yield to the event loop or, when an executor is given,
+        in that executor. Cancelling the call stops the evaluation before the next chunk.
+
+        Args:
+            xs: the points at which to evaluate the function
+            chunk_size: maximum number of points evaluated between two yields to the event loop
+            executor: executor in which the chunks are evaluated, None to evaluate them on the event loop thread
+
+        Returns: the list of the values of the function, in the same order as `xs`
+
+        Raises: ValueError if any of the points is out of bounds
+        """
+        if len(xs) <= chunk_size:
+            return self.evaluate_many(xs)
+        results: List[float] = []
+        for start in range(0, len(xs), chunk_size):
+            results.extend(
+                await self._run_chunk(
+                    self.evaluate_many, executor, xs[start : start + chunk_size]
+                )
+            )
+        return results
+
+    async def aminimum(
+        self, chunk_size: int = ASYNC_CHUNK_SIZE, executor: Optional[Executor] = None
+    ) -> Tuple[float, float]:
+        """
+        Asynchronous counterpart of `minimum`, scanning the intervals in chunks of `chunk_size`.
+
+        See `aevaluate_many` for the handling of chunks, executor and cancellation.
+
+        Returns: (min value, arg min)
+        """
+        return await self._aextremum(self._minimum_between, min, chunk_size, executor)
+
+    async def amaximum(
+        self, chunk_size: int = ASYNC_CHUNK_SIZE, executor: Optional[Executor] = None
+    ) -> Tuple[float, float]:
+        """
+        Asynchronous counterpart of `maximum`, scanning the intervals in chunks of `chunk_size`.
+
+        See `aevaluate_many` for the handling of chunks, executor and cancellation.
+
+        Returns: (max value, arg max)
+        """
+        return await self._aextremum(self._maximum_between, max, chunk_size, executor)
+
+    async def _aextremum(
+        self,
+        extremum_between: Callable[[int, int], Tuple[float, float]],
+        select: Callable,
+        chunk_size: int,
+        executor: Optional[Executor],
+    ) -> Tuple[float, float]:
+        n_intervals = len(self.breakpoints) - 1
+        if n_intervals <= chunk_size:
+            return extremum_between(0, n_intervals)
+        candidates = []
+        for start in range(0, n_intervals, chunk_size):
+            stop = min(start + chunk_size, n_intervals)
+            candidates.append(
+                await self._run_chunk(extremum_between, executor, start, stop)
+            )
+        # Ties are resolved in favor of the leftmost chunk, as done by the synchronous methods
+        return select(candidates, key=lambda candidate: candidate[0])
+
+    @staticmethod
+    async def _run_chunk(fn: Callable, executor: Optional[Executor], *args):
+        if executor is None:
+            result = fn(*args)
+            await asyncio.sleep(0)
+            return result
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
@@ -0,0 +1,196 @@
+import os
+import tempfile
+from array import array
+from typing import IO, List, Optional, Type, Union
+
+from PiecewiseFunctions.PiecewiseConstantFunction import PiecewiseConstantFunction
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+
+# Number of items read at once when loading back spilled buffers
+READ_BLOCK_SIZE = 1 << 16
+
+
+class PiecewiseFunctionBuilder:
+    """
+    Assembles a piecewise function segment by segment, or chunk by chunk.
+
+    The breakpoints and coefficients are appended to typed buffers of doubles, and validated as they arrive, so that
+    `finish` builds the function without a second validation pass. When a memory budget is given, the buffers are
+    spilled to temporary files each time they exceed it.
+
+    Examples:
+        builder = PiecewiseFunctionBuilder(PiecewiseConstantFunction)
+        builder.append(0, 1, 5)
+        builder.extend([1, 2, 4], [3, 7])
+        fn = builder.finish()  # equal to 5 on [0, 1), 3 on [1, 2) and 7 on [2, 4)
+    """
+
+    def __init__(
+        self,
+        function_type: Type[
+            Union[PiecewiseConstantFunction, PiecewiseLinearFunction]
+        ] = PiecewiseLinearFunction,
+        memory_budget: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            function_type: PiecewiseConstantFunction, whose segments have a value, or PiecewiseLinearFunction, whose
+                segments have a slope and an intercept
+            memory_budget (Optional[int]): number of bytes the buffers may hold before being spilled to temporary
+                files, None to keep everything in memory
+
+        Raises: ValueError if function_type is not supported or memory_budget is not positive
+        """
+        if function_type is PiecewiseConstantFunction:
+            n_coefficients = 1
+        elif function_type is PiecewiseLinearFunction:
+            n_coefficients = 2
+        else:
+            raise ValueError(
+                "PiecewiseFunctionBuilder expects PiecewiseConstantFunction or PiecewiseLinearFunction"
+            )
+        if memory_budget is not None and memory_budget <= 0:
+            raise ValueError(
+                "PiecewiseFunctionBuilder expects a positive memory budget"
+            )
+        self.function_type = function_type
+        self.memory_budget = memory_budget
+        # One buffer for the breakpoints followed by one buffer per coefficient
+        self._buffers = [array("d") for _ in range(n_coefficients + 1)]
+        self._spills: Optional[List[IO[bytes]]] = None
+        self._last_breakpoint: Optional[float] = None
+        self._finished = False
+
+    def append(self, start: float, end: float, *coefficients: float) -> None:
+        """
+        Append the segment [start, end) to the function.
+
+        Args:
+            start: start of the segment, equal to the end of the previous segment
+            end: end of the segment
+            coefficients: the value of the segment for a PiecewiseConstantFunction, its slope and intercept for a
+                PiecewiseLinearFunction
+
+        Raises: ValueError if the segment does not follow the previous one or its bounds or coefficients are invalid
+        """
+        self.extend([start, end], *([coefficient] for coefficient in coefficients))
+
+    def extend(self, breakpoints: List[float], *coefficients: List[float]) -> None:
+        """
+        Append a chunk of consecutive segments to the function.
+
+        Args:
+            breakpoints: the n+1 breakpoints of the n segments of the chunk, the first one being equal to the end of
+                the previous segment
+            coefficients: the n values of the segments for a PiecewiseConstantFunction, their n slopes and n
+                intercepts for a PiecewiseLinearFunction
+
+        Raises: ValueError if the chunk does not follow the previous segment or its breakpoints or coefficients are
+        invalid
+        """
+        if self._finished:
+            raise ValueError("PiecewiseFunctionBuilder has already been finished")
+        name = self.function_type.__name__
+        if len(coefficients) != len(self._buffers) - 1:
+            raise ValueError(
+                f"{name} segments expect {len(self._buffers) - 1} coefficient(s)"
+            )
+        n_segments = len(breakpoints) - 1
+        if n_segments < 1:
+            raise ValueError(f"{name} expects to have at least 2 breakpoints")
+        for values in coefficients:
+            if len(values) != n_segments:
+                raise ValueError(
+                    f"{name} expects to have n breakpoints and n-1 values per coefficient"
+                )
+            for value in values:
+                if type(value) not in (float, int):
+                    raise ValueError(
+                        f"{name} expects coefficients to be integer or floating point number"
+                    )
+
+        for border in breakpoints:
+            if type(border) not in (float, int):
+                raise ValueError(
+                    f"{name} expects breakpoint to be integer or floating point number"
+                )
+
+        # Convert the chunk to doubles before checking it, as the checks must hold on the stored values
+        try:
+            chunk_breakpoints = array("d", breakpoints)
+            chunk_coefficients = [array("d", values) for values in coefficients]
+        except OverflowError:
+            raise ValueError(
+                f"{name} expects numbers representable as floating point numbers"
+            )
+
+        # Breakpoints must be increasing, which also makes them unique, and continue the previous segment
+        if (
+            self._last_breakpoint is not None
+            and chunk_breakpoints[0] != self._last_breakpoint
+        ):
+            raise ValueError(
+                f"{name} expects segments to be contiguous, {breakpoints[0]} does not follow {self._last_breakpoint}"
+            )
+        for i in range(n_segments):
+            if not chunk_breakpoints[i + 1] > chunk_breakpoints[i]:
+                raise ValueError(
+                    f"{name} expects breakpoints to be unique and passed in increasing order"
+                )
+
+        if self._last_breakpoint is None:
+            self._buffers[0].append(chunk_breakpoints[0])
+        self._buffers[0].extend(chunk_breakpoints[1:])
+        for buffer, values in zip(self._buffers[1:], chunk_coefficients):
+            buffer.extend(values)
+        self._last_breakpoint = chunk_breakpoints[-1]
+        self._spill_if_needed()
+
+    def finish(self) -> Union[PiecewiseConstantFunction, PiecewiseLinearFunction]:
+        """
+        Build the function from the appended segments, which have already been validated.
+
+        Returns: the PiecewiseConstantFunction or PiecewiseLinearFunction made of the appended segments
+
+        Raises: ValueError if no segment has been appended or the builder has already been finished
+        """
+        if self._finished:
+            raise ValueError("PiecewiseFunctionBuilder has already been finished")
+        if self._last_breakpoint is None:
+            raise ValueError(
+                f"{self.function_type.__name__} expects to have at least 2 breakpoints"
+            )
+        self._finished = True
+        columns = []
+        for i, buffer in enumerate(self._buffers):
+            column: List[float] = []
+            if self._spills is not None:
+                self._load(self._spills[i], column)
+                self._spills[i].close()
+            column.extend(buffer)
+            del buffer[:]
+            columns.append(column)
+        return self.function_type._unchecked(*columns)
+
+    def _spill_if_needed(self) -> None:
+        if self.memory_budget is None:
+            return
+        size = sum(len(buffer) * buffer.itemsize for buffer in self._buffers)
+        if size <= self.memory_budget:
+            return
+        if self._spills is None:
+            self._spills = [tempfile.TemporaryFile() for _ in self._buffers]
+        for buffer, spill in zip(self._buffers, self._spills):
+            buffer.tofile(spill)
+            del buffer[:]
+
+    @staticmethod
+    def _load(spill: IO[bytes], column: List[float]) -> None:
+        """Append the content of a spill file to column, block by block."""
+        remaining = spill.seek(0, os.SEEK_END) // array("d").itemsize
+        spill.seek(0)
+        while remaining:
+            block = array("d")
+            block.fromfile(spill, min(remaining, READ_BLOCK_SIZE))
+            column.extend(block)
+            remaining -= len(block)
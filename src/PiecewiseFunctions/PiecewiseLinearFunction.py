@@ -1,6 +1,16 @@
-from typing import List, Tuple, Any
+import math
+from bisect import bisect_right
+from typing import TYPE_CHECKING, List, Tuple, Any, Optional
 
-from PiecewiseFunctions.PiecewiseFunction import PiecewiseFunction
+from PiecewiseFunctions.PiecewiseFunction import (
+    VECTORIZE_THRESHOLD,
+    PiecewiseFunction,
+    np,
+)
+from PiecewiseFunctions.rolling import rolling_extremum, rolling_mean
+
+if TYPE_CHECKING:
+    import numpy
 
 
 class PiecewiseLinearFunction(PiecewiseFunction):
@@ -49,6 +59,19 @@ class PiecewiseLinearFunction(PiecewiseFunction):
         self.slopes = slopes
         self.intercepts = intercepts
 
+    @classmethod
+    def _unchecked(
+        cls, breakpoints: List[float], slopes: List[float], intercepts: List[float]
+    ) -> "PiecewiseLinearFunction":
+        """
+        Build a function from inputs known to be valid, e.g. computed from other functions, skipping `sanity_check`.
+        """
+        fn = cls.__new__(cls)
+        fn.breakpoints = breakpoints
+        fn.slopes = slopes
+        fn.intercepts = intercepts
+        return fn
+
     @staticmethod
     def sanity_check(breakpoints: Any, slopes: Any, intercepts: Any) -> None:
         """
@@ -146,15 +169,107 @@ class PiecewiseLinearFunction(PiecewiseFunction):
                 return self.slopes[i] * x + self.intercepts[i]
         raise ValueError(f"x={x} is out of bounds")
 
+    def evaluate_many(self, xs: List[float]) -> List[float]:
+        """
+        Evaluate the function on a batch of points.
+
+        Each point is located with a binary search over the breakpoints, so evaluating m points costs O(m log n)
+        instead of the O(m n) of calling `evaluate` in a loop. When numpy is available, batches of at least
+        VECTORIZE_THRESHOLD points are located with a single vectorized search.
+
+        Args:
+            xs (List[float]): The points at which to evaluate the function.
+
+        Returns:
+            The list of the values of the function, in the same order as `xs`.
+
+        Raises: ValueError if any of the points is out of bound
+
+        """
+        if np is not None and len(xs) >= VECTORIZE_THRESHOLD:
+            points, indices = self._locate_many(xs)
+            slopes, intercepts = self._array("slopes"), self._array("intercepts")
+            # Like `evaluate`, a null slope at an infinite point gives nan, without warning
+            with np.errstate(invalid="ignore"):
+                return (slopes[indices] * points + intercepts[indices]).tolist()
+        breakpoints = self.breakpoints
+        lower, upper = breakpoints[0], breakpoints[-1]
+        results = []
+        for x in xs:
+            if not lower <= x < upper:
+                raise ValueError(f"x={x} is out of bounds")
+            i = bisect_right(breakpoints, x) - 1
+            results.append(self.slopes[i] * x + self.intercepts[i])
+        return results
+
+    def evaluate_with_gradient(
+        self, xs: List[float], side: str = "right"
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Evaluate the function and its gradient on a batch of points, locating all the points with a single vectorized
+        search. Requires numpy.
+
+        Args:
+            xs (List[float]): The points at which to evaluate the function.
+            side (str): the gradient returned at an inner breakpoint, where the slope changes: "right" for the slope
+                of the piece on its right, "left" for the slope of the piece on its left, "interval" for the
+                (lowest, highest) pair of both slopes, which is the subdifferential of a convex function. Away from
+                the inner breakpoints both slopes are equal.
+
+        Returns:
+            (values, gradients, indices) arrays where indices are the indices of the pieces on which the points lie,
+            gradients has a shape (m, 2) for side="interval" and (m,) otherwise
+
+        Raises: ValueError if any of the points is out of bound or if side is not valid
+
+        """
+        self._require_numpy("evaluate_with_gradient")
+        if side not in ("left", "right", "interval"):
+            raise ValueError(f"side={side} should be one of left, right or interval")
+        points, indices = self._locate_many(xs)
+        slopes = self._array("slopes")
+        gradients = slopes[indices]
+        with np.errstate(invalid="ignore"):
+            values = gradients * points + self._array("intercepts")[indices]
+        if side == "right":
+            return values, gradients, indices
+        # Points on an inner breakpoint also have the slope of the piece on their left
+        on_breakpoint = (indices > 0) & (points == self._array("breakpoints")[indices])
+        left_gradients = np.where(on_breakpoint, slopes[indices - 1], gradients)
+        if side == "left":
+            return values, left_gradients, indices
+        interval = np.stack(
+            [
+                np.minimum(left_gradients, gradients),
+                np.maximum(left_gradients, gradients),
+            ],
+            axis=1,
+        )
+        return values, interval, indices
+
     def minimum(self) -> Tuple[float, float]:
         """
         Returns (min_value: float, arg_min: float): the minimum value of the function over its domain of definition,
         as well as the corresponding argument where this minimum value is attained.
         """
+        return self._minimum_between(0, len(self.slopes))
+
+    def maximum(self) -> Tuple[float, float]:
+        """
+        Returns (max_value: float, arg_max: float): the maximum value of the function over its domain of definition,
+        as well as the corresponding argument where this maximum value is attained.
+        """
+        return self._maximum_between(0, len(self.slopes))
+
+    def _minimum_between(self, start: int, stop: int) -> Tuple[float, float]:
+        """
+        Returns (min_value: float, arg_min: float): the minimum value of the function over the intervals of index
+        start (included) to stop (excluded), as well as the corresponding argument.
+        """
         min_value = float("inf")
         argmin_candidate = None
         argmin = None
-        for i in range(len(self.breakpoints) - 1):
+        for i in range(start, stop):
             if self.slopes[i] == 0:
                 value = self.intercepts[i]
                 argmin_candidate = self.breakpoints[i]
@@ -169,15 +284,15 @@ class PiecewiseLinearFunction(PiecewiseFunction):
                 argmin = argmin_candidate
         return min_value, argmin
 
-    def maximum(self) -> Tuple[float, float]:
+    def _maximum_between(self, start: int, stop: int) -> Tuple[float, float]:
         """
-        Returns (max_value: float, arg_max: float): the maximum value of the function over its domain of definition,
-        as well as the corresponding argument where this maximum value is attained.
+        Returns (max_value: float, arg_max: float): the maximum value of the function over the intervals of index
+        start (included) to stop (excluded), as well as the corresponding argument.
         """
         max_value = float("-inf")
         argmax = None
         argmax_candidate = None
-        for i in range(len(self.breakpoints) - 1):
+        for i in range(start, stop):
             if self.slopes[i] == 0:
                 value = self.intercepts[i]
                 argmax_candidate = self.breakpoints[i]
@@ -191,3 +306,126 @@ class PiecewiseLinearFunction(PiecewiseFunction):
                 max_value = value
                 argmax = argmax_candidate
         return max_value, argmax
+
+    def integrate(self, x_min: float, x_max: float) -> float:
+        """
+        Integral of the function over [x_min, x_max].
+
+        On each interval the primitive of `y = ax + b` is `a x^2 / 2 + b x`, the integral is the sum of the primitive
+        differences over the intervals overlapping [x_min, x_max].
+
+        Args:
+            x_min (float): lower bound of the integration interval
+            x_max (float): upper bound of the integration interval
+
+        Returns: the integral of the function over [x_min, x_max]
+
+        Raises: ValueError if x_min > x_max or if the interval is not included in the domain of the function
+        """
+        if x_min > x_max:
+            raise ValueError(f"x_min={x_min} is greater than x_max={x_max}")
+        if x_min < self.breakpoints[0] or x_max > self.breakpoints[-1]:
+            raise ValueError(f"[{x_min}, {x_max}] is out of bounds")
+        if x_min == x_max:
+            return 0.0
+        total = 0.0
+        i = max(bisect_right(self.breakpoints, x_min) - 1, 0)
+        while i < len(self.slopes) and self.breakpoints[i] < x_max:
+            left = max(self.breakpoints[i], x_min)
+            right = min(self.breakpoints[i + 1], x_max)
+            total += self.slopes[i] * (right * right - left * left) / 2
+            total += self.intercepts[i] * (right - left)
+            i += 1
+        return total
+
+    def rolling_max(self, width: float) -> "PiecewiseLinearFunction":
+        """
+        Maximum of the function over the trailing window [x - width, x], computed exactly in O(n).
+
+        Args:
+            width (float): width of the window
+
+        Returns: the rolling maximum, defined from the first breakpoint + width to the last breakpoint
+
+        Raises: ValueError if width is not strictly positive or larger than the domain of the function
+        """
+        return PiecewiseLinearFunction._unchecked(
+            *rolling_extremum(self.breakpoints, self.slopes, self.intercepts, width, 1)
+        )
+
+    def rolling_min(self, width: float) -> "PiecewiseLinearFunction":
+        """
+        Minimum of the function over the trailing window [x - width, x], computed exactly in O(n).
+
+        See rolling_max.
+        """
+        return PiecewiseLinearFunction._unchecked(
+            *rolling_extremum(self.breakpoints, self.slopes, self.intercepts, width, -1)
+        )
+
+    def rolling_mean(self, width: float) -> "PiecewiseLinearFunction":
+        """
+        Mean of the function over the trailing window [x - width, x], computed in O(n).
+
+        Warnings: the mean is exact where both ends of the window lie on pieces of equal slopes. Elsewhere, the mean
+        is quadratic in x and cannot be represented by a piecewise linear function, it is replaced by its chord, exact
+        at the breakpoints of the result, i.e., the breakpoints of the function and the breakpoints shifted by width.
+
+        Args:
+            width (float): width of the window
+
+        Returns: the rolling mean, defined from the first breakpoint + width to the last breakpoint
+
+        Raises: ValueError if width is not strictly positive or larger than the domain of the function
+        """
+        return PiecewiseLinearFunction._unchecked(
+            *rolling_mean(self.breakpoints, self.slopes, self.intercepts, width)
+        )
+
+    def sample(
+        self, n: int, rng: Optional["numpy.random.Generator"] = None
+    ) -> "numpy.ndarray":
+        """
+        Draw random variates using the function as an unnormalized density.
+
+        The cumulative mass of the function is computed on the first call and reused by the following ones, each call
+        then draws the variates with a vectorized inversion of the cumulative distribution. Requires numpy.
+
+        Warnings: each variate costs a binary search over the pieces, drawing 10^7 variates takes a fraction of a second
+        for densities with a few pieces, but a couple of seconds for densities with 100k pieces.
+
+        Args:
+            n: number of variates to draw
+            rng: numpy random generator, a new default generator when None
+
+        Returns: a numpy array of n variates
+
+        Raises: ValueError if the function is negative somewhere, has an infinite mass or a null total mass
+        """
+        from PiecewiseFunctions.sampling import PiecewiseDensitySampler
+
+        if getattr(self, "_sampler", None) is None:
+            self._sampler = PiecewiseDensitySampler(
+                self.breakpoints, self.slopes, self.intercepts
+            )
+        return self._sampler.sample(n, rng)
+
+    def is_convex(self, rel_tol: float = 1e-9, abs_tol: float = 1e-9) -> bool:
+        """
+        A piecewise linear function is convex if it is continuous and its slopes are non-decreasing.
+
+        Args:
+            rel_tol (float): relative tolerance when checking continuity at the breakpoints, see `math.isclose`
+            abs_tol (float): absolute tolerance when checking continuity at the breakpoints, see `math.isclose`
+
+        Returns: True if the function is convex over its domain of definition
+        """
+        for i in range(len(self.slopes) - 1):
+            if self.slopes[i] > self.slopes[i + 1]:
+                return False
+            x = self.breakpoints[i + 1]
+            left = self.slopes[i] * x + self.intercepts[i]
+            right = self.slopes[i + 1] * x + self.intercepts[i + 1]
+            if not math.isclose(left, right, rel_tol=rel_tol, abs_tol=abs_tol):
+                return False
+        return True
@@ -0,0 +1,269 @@
+from bisect import bisect_right
+from typing import List, Tuple, Union
+
+from PiecewiseFunctions.PiecewiseConstantFunction import PiecewiseConstantFunction
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional, only batch_crossings requires it
+    np = None
+
+Piecewise = Union[PiecewiseConstantFunction, PiecewiseLinearFunction]
+
+
+def _linear_pieces(fn: Piecewise) -> Tuple[List[float], List[float]]:
+    """
+    Returns: (slopes, intercepts) of the pieces of fn, a piecewise constant function having null slopes
+    """
+    if isinstance(fn, PiecewiseLinearFunction):
+        return fn.slopes, fn.intercepts
+    if isinstance(fn, PiecewiseConstantFunction):
+        return [0] * len(fn.values), fn.values
+    raise ValueError("Expects a PiecewiseConstantFunction or a PiecewiseLinearFunction")
+
+
+def _locate(breakpoints: List[float], y: float, hint: int) -> int:
+    """
+    Index i of the interval [breakpoints[i], breakpoints[i + 1]) containing y.
+
+    The search gallops away from `hint`, its cost is logarithmic in the distance between the hint and the result, so
+    successive lookups of nearby values cost O(1) each.
+    """
+    n = len(breakpoints)
+    if breakpoints[hint] <= y:
+        step, low, high = 1, hint, hint + 1
+        while high < n and breakpoints[high] <= y:
+            low, high = high, high + step
+            step *= 2
+        return bisect_right(breakpoints, y, low, min(high, n)) - 1
+    step, low, high = 1, hint - 1, hint
+    while low > 0 and breakpoints[low] > y:
+        low, high = low - step, low
+        step *= 2
+    return bisect_right(breakpoints, y, max(low, 0), high) - 1
+
+
+def _sign(value: float) -> int:
+    return (value > 0) - (value < 0)
+
+
+def compose(f: Piecewise, g: Piecewise) -> Piecewise:
+    """
+    Exact composition `x -> f(g(x))` of two piecewise functions.
+
+    Each linear piece `y = ax + b` of g is cut at the preimages of the breakpoints of f it crosses, and each resulting
+    piece maps into a single piece of f, making the composition a piecewise function defined on the domain of g. The
+    piece of f holding the start of a piece of g is searched from the piece of f reached at the end of the previous
+    piece of g, so that when g is continuous and monotone the breakpoints of f and g are swept once, in O(n + m).
+
+    Args:
+        f: the outer function, piecewise constant or piecewise linear
+        g: the inner function, piecewise constant or piecewise linear
+
+    Returns: a PiecewiseConstantFunction if f or g is piecewise constant, a PiecewiseLinearFunction otherwise
+
+    Raises: ValueError if the image of g is not included in the domain of f
+
+    Warnings: on a decreasing piece of g, a point x whose image g(x) is exactly a jump of f is given the value of the
+    piece of f on the left of the jump, as the pieces of the composition are closed on their left end.
+    """
+    f_slopes, f_intercepts = _linear_pieces(f)
+    g_slopes, g_intercepts = _linear_pieces(g)
+    f_breakpoints, g_breakpoints = f.breakpoints, g.breakpoints
+    lower, upper = f_breakpoints[0], f_breakpoints[-1]
+
+    breakpoints = [g_breakpoints[0]]
+    slopes: List[float] = []
+    intercepts: List[float] = []
+
+    def add_piece(end: float, j: int, a: float, b: float) -> None:
+        slope = f_slopes[j] * a
+        intercept = (
+            f_slopes[j] * b + f_intercepts[j] if f_slopes[j] else f_intercepts[j]
+        )
+        if slopes and slopes[-1] == slope and intercepts[-1] == intercept:
+            # Same equation as the previous piece, extend it
+            breakpoints[-1] = end
+            return
+        breakpoints.append(end)
+        slopes.append(slope)
+        intercepts.append(intercept)
+
+    j = 0
+    for i in range(len(g_slopes)):
+        a, b = g_slopes[i], g_intercepts[i]
+        x_start, x_end = g_breakpoints[i], g_breakpoints[i + 1]
+        if a == 0:
+            y_start = y_end = b
+        else:
+            y_start, y_end = a * x_start + b, a * x_end + b
+        # The piece of g covers [x_start, x_end), its image is y_start up to y_end excluded unless the piece is flat
+        if not lower <= y_start < upper or (a != 0 and not lower <= y_end <= upper):
+            raise ValueError(
+                f"Image of [{x_start}, {x_end}) is out of the domain of the outer function"
+            )
+        j = _locate(f_breakpoints, y_start, j)
+        if a > 0:
+            while f_breakpoints[j + 1] < y_end:
+                x = (f_breakpoints[j + 1] - b) / a
+                if x_start < x < x_end and x > breakpoints[-1]:
+                    add_piece(x, j, a, b)
+                j += 1
+        elif a < 0:
+            while f_breakpoints[j] > y_end:
+                x = (f_breakpoints[j] - b) / a
+                if x_start < x < x_end and x > breakpoints[-1]:
+                    add_piece(x, j, a, b)
+                j -= 1
+        add_piece(x_end, j, a, b)
+
+    if isinstance(f, PiecewiseConstantFunction) or isinstance(
+        g, PiecewiseConstantFunction
+    ):
+        return PiecewiseConstantFunction(breakpoints, intercepts)
+    return PiecewiseLinearFunction(breakpoints, slopes, intercepts)
+
+
+def crossings(
+    f: Piecewise, g: Piecewise
+) -> Tuple[List[float], PiecewiseConstantFunction]:
+    """
+    Points where two piecewise functions cross each other.
+
+    The merged breakpoints of f and g are swept once, in O(n + m). Between two consecutive merged breakpoints both
+    functions are linear, so that their difference changes sign at most once, at the root of a linear equation.
+
+    Args:
+        f: a piecewise constant or piecewise linear function
+        g: a piecewise constant or piecewise linear function
+
+    Returns: (crossing points, on top) where crossing points are the points where the sign of f - g changes, either
+    because the functions intersect or because one of them jumps past the other, and on top is the piecewise constant
+    function over the common domain of f and g equal to 1 where f is above g, -1 where g is above f and 0 where both
+    are equal. The crossing points are the inner breakpoints of on top.
+
+    Raises: ValueError if the domains of definition of f and g do not overlap
+    """
+    return _crossings(f.breakpoints, *_linear_pieces(f), g)
+
+
+def batch_crossings(
+    f: Piecewise, others: List[Piecewise]
+) -> List[Tuple[List[float], PiecewiseConstantFunction]]:
+    """
+    Crossings of a function with each function of a collection, see `crossings`. Requires numpy.
+
+    Instead of sweeping the merged breakpoints one at a time, the merged breakpoints of f and each function of the
+    collection are located in both functions with a single vectorized binary search, and the signs of the difference
+    and its roots are computed over all the intervals at once. The pieces of f are converted to arrays once for the
+    whole collection.
+
+    Returns: the list of (crossing points, on top), in the same order as `others`
+
+    Raises: ValueError if the domain of f does not overlap the domain of one of the functions
+    """
+    if np is None:
+        raise ImportError("batch_crossings requires numpy")
+    f_breakpoints = np.asarray(f.breakpoints, dtype=float)
+    f_slopes, f_intercepts = (
+        np.asarray(values, dtype=float) for values in _linear_pieces(f)
+    )
+    return [_batch_crossing(f_breakpoints, f_slopes, f_intercepts, g) for g in others]
+
+
+def _batch_crossing(
+    f_breakpoints: "np.ndarray",
+    f_slopes: "np.ndarray",
+    f_intercepts: "np.ndarray",
+    g: Piecewise,
+) -> Tuple[List[float], PiecewiseConstantFunction]:
+    g_breakpoints = np.asarray(g.breakpoints, dtype=float)
+    g_slopes, g_intercepts = (
+        np.asarray(values, dtype=float) for values in _linear_pieces(g)
+    )
+    start = max(f_breakpoints[0], g_breakpoints[0])
+    end = min(f_breakpoints[-1], g_breakpoints[-1])
+    if start >= end:
+        raise ValueError("Expects functions with overlapping domains of definition")
+
+    merged = np.union1d(f_breakpoints, g_breakpoints)
+    merged = merged[(start <= merged) & (merged <= end)]
+    lefts, rights = merged[:-1], merged[1:]
+    i = np.searchsorted(f_breakpoints, lefts, side="right") - 1
+    j = np.searchsorted(g_breakpoints, lefts, side="right") - 1
+    slopes = f_slopes[i] - g_slopes[j]
+    intercepts = f_intercepts[i] - g_intercepts[j]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roots = -intercepts / slopes
+    # Each interval holds a region ending at its right end, preceded by a region ending at the root when the difference
+    # changes sign strictly inside the interval, as in the sequential sweep of `crossings`
+    splits = (slopes != 0) & (lefts < roots) & (roots < rights)
+    slope_signs = np.sign(slopes)
+    final_signs = np.where(
+        slopes == 0,
+        np.sign(intercepts),
+        np.where(roots <= lefts, slope_signs, -slope_signs),
+    )
+    final_signs[splits] = slope_signs[splits]
+    ends = np.stack([roots, rights], axis=1).ravel()
+    signs = np.stack([-slope_signs, final_signs], axis=1).ravel()
+    kept = np.stack([splits, np.ones_like(splits)], axis=1).ravel()
+    ends, signs = ends[kept], signs[kept].astype(int)
+    # Consecutive regions of the same sign are merged into the last of them
+    last = np.append(signs[1:] != signs[:-1], True)
+    breakpoints = [float(start)] + ends[last].tolist()
+    on_top = PiecewiseConstantFunction._unchecked(breakpoints, signs[last].tolist())
+    return breakpoints[1:-1], on_top
+
+
+def _crossings(
+    f_breakpoints: List[float],
+    f_slopes: List[float],
+    f_intercepts: List[float],
+    g: Piecewise,
+) -> Tuple[List[float], PiecewiseConstantFunction]:
+    g_slopes, g_intercepts = _linear_pieces(g)
+    g_breakpoints = g.breakpoints
+    start = max(f_breakpoints[0], g_breakpoints[0])
+    end = min(f_breakpoints[-1], g_breakpoints[-1])
+    if start >= end:
+        raise ValueError("Expects functions with overlapping domains of definition")
+
+    breakpoints = [start]
+    signs: List[int] = []
+
+    def add_region(region_end: float, sign: int) -> None:
+        if signs and signs[-1] == sign:
+            breakpoints[-1] = region_end
+        else:
+            breakpoints.append(region_end)
+            signs.append(sign)
+
+    i = bisect_right(f_breakpoints, start) - 1
+    j = bisect_right(g_breakpoints, start) - 1
+    left = start
+    while left < end:
+        right = min(f_breakpoints[i + 1], g_breakpoints[j + 1], end)
+        slope = f_slopes[i] - g_slopes[j]
+        intercept = f_intercepts[i] - g_intercepts[j]
+        if slope == 0:
+            add_region(right, _sign(intercept))
+        else:
+            root = -intercept / slope
+            if left < root < right:
+                add_region(root, -_sign(slope))
+                add_region(right, _sign(slope))
+            elif root <= left:
+                add_region(right, _sign(slope))
+            else:
+                add_region(right, -_sign(slope))
+        if f_breakpoints[i + 1] == right:
+            i += 1
+        if g_breakpoints[j + 1] == right:
+            j += 1
+        left = right
+
+    on_top = PiecewiseConstantFunction._unchecked(breakpoints, signs)
+    return breakpoints[1:-1], on_top
@@ -0,0 +1,179 @@
+import math
+from bisect import bisect_right
+from collections import deque
+from typing import Iterator, List, Tuple
+
+# (breakpoints, slopes, intercepts) of a piecewise linear function
+Pieces = Tuple[List[float], List[float], List[float]]
+Line = Tuple[float, float]
+
+
+def _check_window(breakpoints: List[float], width: float) -> None:
+    if not 0 < width < math.inf:
+        raise ValueError(f"Window width {width} should be strictly positive and finite")
+    if breakpoints[0] + width >= breakpoints[-1]:
+        raise ValueError(
+            f"Window width {width} is larger than the domain of the function"
+        )
+
+
+def _windows(
+    breakpoints: List[float], width: float
+) -> Iterator[Tuple[float, float, int, int]]:
+    """
+    Sweep the trailing windows [x - width, x] for x over [breakpoints[0] + width, breakpoints[-1]).
+
+    Yields: (left, right, i, k) such that for x in [left, right), x is in the interval of index i and x - width in
+    the interval of index k
+    """
+    end = breakpoints[-1]
+    x = breakpoints[0] + width
+    i = bisect_right(breakpoints, x) - 1
+    k = 0
+    while x < end:
+        following = min(breakpoints[i + 1], breakpoints[k + 1] + width, end)
+        if following > x:
+            yield x, following, i, k
+            x = following
+        if x < end and breakpoints[i + 1] <= x:
+            i += 1
+        if breakpoints[k + 1] + width <= x:
+            k += 1
+
+
+def _append(pieces: Pieces, end: float, slope: float, intercept: float) -> None:
+    breakpoints, slopes, intercepts = pieces
+    if slopes and slopes[-1] == slope and intercepts[-1] == intercept:
+        # Same equation as the previous piece, extend it
+        breakpoints[-1] = end
+    else:
+        breakpoints.append(end)
+        slopes.append(slope)
+        intercepts.append(intercept)
+
+
+def _upper_envelope(
+    lines: List[Line], left: float, right: float
+) -> List[Tuple[float, Line]]:
+    """
+    Returns: the pieces (end, line) of the maximum of the lines (slope, intercept) over [left, right)
+    """
+    if left == -math.inf:
+        current = max(lines, key=lambda line: (-line[0], line[1]))
+    else:
+        current = max(lines, key=lambda line: (line[0] * left + line[1], line[0]))
+    envelope: List[Tuple[float, Line]] = []
+    x = left
+    while True:
+        # The line overtaking the current one first is the next piece of the envelope. A steeper line crossing at or
+        # before x, which rounding may cause when the lines are equal at the left end, is above from x on and takes
+        # over immediately. Slopes strictly increase at each step, so that the loop ends.
+        following, overtaking = right, None
+        for line in lines:
+            if line[0] > current[0]:
+                crossing = (current[1] - line[1]) / (line[0] - current[0])
+                if crossing < following:
+                    following, overtaking = max(crossing, x), line
+        if following > x:
+            envelope.append((following, current))
+        if overtaking is None:
+            return envelope
+        x, current = following, overtaking
+
+
+def rolling_extremum(
+    breakpoints: List[float],
+    slopes: List[float],
+    intercepts: List[float],
+    width: float,
+    sign: int,
+) -> Pieces:
+    """
+    Maximum (sign=1) or minimum (sign=-1) of a piecewise linear function over the trailing window [x - width, x].
+
+    Over a window, the function reaches its supremum either on one of the two pieces partially covered by the window,
+    whose contributions are linear in x, or on one of the pieces fully covered by the window, whose contribution is
+    constant. The suprema of the fully covered pieces are kept in a monotonic deque as the window slides, so that the
+    sweep costs O(n).
+
+    Returns: the pieces of the result, defined over [breakpoints[0] + width, breakpoints[-1])
+
+    Raises: ValueError if width is not strictly positive or larger than the domain of the function
+    """
+    _check_window(breakpoints, width)
+    # The minimum is the opposite of the maximum of the opposite function
+    a = [sign * slope for slope in slopes]
+    c = [sign * intercept for intercept in intercepts]
+    b = breakpoints
+
+    def supremum(l: int) -> float:
+        return max(a[l] * b[l] + c[l], a[l] * b[l + 1] + c[l])
+
+    result: Pieces = ([b[0] + width], [], [])
+    # Indices of the pieces fully covered by the window, by decreasing supremum
+    covered: deque = deque()
+    next_covered = 1
+    for left, right, i, k in _windows(b, width):
+        while next_covered < i:
+            while covered and supremum(covered[-1]) <= supremum(next_covered):
+                covered.pop()
+            covered.append(next_covered)
+            next_covered += 1
+        while covered and covered[0] <= k:
+            covered.popleft()
+
+        lines = [(a[i], c[i]), (a[k], c[k] - a[k] * width)]
+        if i != k:
+            constant = max(a[i] * b[i] + c[i], a[k] * b[k + 1] + c[k])
+            if covered:
+                constant = max(constant, supremum(covered[0]))
+            lines.append((0, constant))
+        for end, (slope, intercept) in _upper_envelope(lines, left, right):
+            _append(result, end, sign * slope, sign * intercept)
+    return result
+
+
+def rolling_mean(
+    breakpoints: List[float],
+    slopes: List[float],
+    intercepts: List[float],
+    width: float,
+) -> Pieces:
+    """
+    Mean of a piecewise linear function over the trailing window [x - width, x].
+
+    The integrals of the pieces are accumulated once into prefix sums, so that the integral over any window costs
+    O(1). When both ends of the window lie on pieces of equal slopes the mean is linear in x, it is otherwise
+    quadratic and replaced by its chord between the consecutive breakpoints of the result, which is exact at these
+    breakpoints. The result is exact for piecewise constant functions.
+
+    Returns: the pieces of the result, defined over [breakpoints[0] + width, breakpoints[-1])
+
+    Raises: ValueError if width is not strictly positive or larger than the domain of the function
+    """
+    _check_window(breakpoints, width)
+    a, b, c = slopes, breakpoints, intercepts
+    n = len(slopes)
+
+    def integral(l: int, lo: float, hi: float) -> float:
+        return a[l] * (hi * hi - lo * lo) / 2 + c[l] * (hi - lo)
+
+    # prefix[l] is the integral over the pieces 1 to l - 1, the first piece may be infinite
+    prefix = [0.0, 0.0]
+    for l in range(1, n - 1):
+        prefix.append(prefix[-1] + integral(l, b[l], b[l + 1]))
+
+    def window_mean(x: float, i: int, k: int) -> float:
+        total = integral(k, x - width, b[k + 1]) + prefix[i] - prefix[k + 1]
+        return (total + integral(i, b[i], x)) / width
+
+    result: Pieces = ([b[0] + width], [], [])
+    for left, right, i, k in _windows(b, width):
+        if i == k:
+            # The mean of a linear function over the window is its value at the middle of the window
+            _append(result, right, a[i], c[i] - a[i] * width / 2)
+        else:
+            mean_left, mean_right = window_mean(left, i, k), window_mean(right, i, k)
+            slope = (mean_right - mean_left) / (right - left)
+            _append(result, right, slope, mean_left - slope * left)
+    return result
@@ -0,0 +1,79 @@
+import math
+from typing import List, Optional
+
+import numpy as np
+
+
+class PiecewiseDensitySampler:
+    """
+    Draws random variates from a non-negative piecewise linear function used as an unnormalized density.
+
+    The mass of each piece and the cumulative mass are computed once at construction, each draw then costs a binary
+    search over the cumulative mass and the inversion of the cumulative distribution within the selected piece, both
+    vectorized over the variates.
+    """
+
+    def __init__(
+        self, breakpoints: List[float], slopes: List[float], intercepts: List[float]
+    ) -> None:
+        """
+        Args:
+            breakpoints (List[float]): breakpoints of the density
+            slopes (List[float]): slopes of the pieces of the density, 0 for a piecewise constant density
+            intercepts (List[float]): intercepts of the pieces of the density
+
+        Raises: ValueError if the density is negative somewhere, has an infinite mass or a null total mass
+        """
+        n = len(slopes)
+        lefts = np.zeros(n)
+        densities = np.zeros(n)
+        masses = np.zeros(n)
+        for i in range(n):
+            left, right = breakpoints[i], breakpoints[i + 1]
+            a, c = slopes[i], intercepts[i]
+            if a == 0 and c == 0:
+                # Null density, possibly over an infinite piece
+                continue
+            if not (math.isfinite(left) and math.isfinite(right)):
+                raise ValueError(f"Density has an infinite mass over [{left}, {right})")
+            density_left, density_right = a * left + c, a * right + c
+            if density_left < 0 or density_right < 0:
+                raise ValueError(f"Density is negative over [{left}, {right})")
+            lefts[i] = left
+            densities[i] = density_left
+            masses[i] = (density_left + density_right) / 2 * (right - left)
+        self.cumulative_mass = np.cumsum(masses)
+        self.total_mass = float(self.cumulative_mass[-1])
+        if self.total_mass <= 0:
+            raise ValueError("Density has a null total mass")
+        self._lefts = lefts
+        self._densities = densities
+        self._slopes = np.asarray(slopes, dtype=float)
+        self._starts = self.cumulative_mass - masses
+        self._constant = not np.any(self._slopes)
+
+    def sample(self, n: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Args:
+            n: number of variates to draw
+            rng: random generator, a new default generator when None
+
+        Returns: an array of n variates
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        u = rng.random(n) * self.total_mass
+        pieces = np.searchsorted(self.cumulative_mass, u, side="right")
+        np.minimum(pieces, len(self.cumulative_mass) - 1, out=pieces)
+        # The offset t within the piece solves d t + s t^2 / 2 = r, where r is the mass to cover in the piece, d the
+        # density at its left end and s its slope
+        r = u - self._starts[pieces]
+        d = self._densities[pieces]
+        if self._constant:
+            return self._lefts[pieces] + r / d
+        # Root written in a form that does not cancel when s is small
+        s = self._slopes[pieces]
+        denominator = d + np.sqrt(np.maximum(d * d + 2 * s * r, 0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            offsets = np.where(denominator > 0, 2 * r / denominator, 0.0)
+        return self._lefts[pieces] + offsets
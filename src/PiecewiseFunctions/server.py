@@ -0,0 +1,416 @@
+"""
+Local evaluation server for piecewise functions.
+
+The server loads named piecewise functions once and serves `evaluate`, `minimum`, `maximum` and `integrate`
+requests to many local clients over a Unix socket or a localhost TCP port.
+
+Concurrent `evaluate` requests targeting the same function are merged into a single `evaluate_many` call: the first
+request of a batch opens a time window of `max_latency` seconds during which other requests are accumulated, until the
+window closes or `max_batch_size` points are queued.
+
+The wire protocol is newline delimited JSON. A request is an object with an `id`, an `op` among `evaluate`,
+`minimum`, `maximum` and `integrate`, the name of the `function` and the arguments of the operation (`x` for
+`evaluate`, `x_min` and `x_max` for `integrate`). The response holds the same `id` and either a `result` or an `error`.
+
+Run `python -m PiecewiseFunctions.server` to benchmark the server against a synthetic load.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from PiecewiseFunctions.PiecewiseFunction import PiecewiseFunction
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+
+# A Unix socket path or a (host, port) pair
+Address = Union[str, Tuple[str, int]]
+
+# Maximum size of a single request or response line
+STREAM_LIMIT = 2**24
+
+
+class _Batcher:
+    """
+    Accumulates the `evaluate` requests targeting a function and evaluates them in batches.
+    """
+
+    def __init__(
+        self, fn: PiecewiseFunction, max_batch_size: int, max_latency: float
+    ) -> None:
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.batch_count = 0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, xs: List[float]) -> List[float]:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((xs, future))
+        return await future
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_latency
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[List[float], asyncio.Future]]) -> None:
+        self.batch_count += 1
+        points = [x for xs, _ in batch for x in xs]
+        try:
+            values = self.fn.evaluate_many(points)
+        except Exception:
+            # At least one request is invalid, evaluate the requests one by one so that only their sender gets the
+            # error.
+            for xs, future in batch:
+                if future.done():
+                    continue
+                try:
+                    future.set_result(self.fn.evaluate_many(xs))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+        offset = 0
+        for xs, future in batch:
+            if not future.done():
+                future.set_result(values[offset : offset + len(xs)])
+            offset += len(xs)
+
+
+class EvaluationServer:
+    """
+    Serves evaluation requests over a set of named piecewise functions.
+
+    Examples:
+        server = EvaluationServer({"price": price_fn}, max_batch_size=4096, max_latency=0.001)
+        await server.start_unix("/tmp/piecewise.sock")
+        await server.serve_forever()
+    """
+
+    def __init__(
+        self,
+        functions: Dict[str, PiecewiseFunction],
+        max_batch_size: int = 4096,
+        max_latency: float = 0.001,
+    ) -> None:
+        """
+        Args:
+            functions (Dict[str, PiecewiseFunction]): the functions to serve, by name
+            max_batch_size (int): number of points after which a batch is evaluated without waiting for the end of
+                its time window
+            max_latency (float): duration, in seconds, during which requests are accumulated into a batch
+
+        Raises: ValueError if max_batch_size is not strictly positive or max_latency is negative
+        """
+        if max_batch_size < 1:
+            raise ValueError("EvaluationServer expects max_batch_size to be at least 1")
+        if max_latency < 0:
+            raise ValueError("EvaluationServer expects max_latency to be non negative")
+        self.functions = functions
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._batchers: Dict[str, _Batcher] = {}
+        self._extrema: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def batch_count(self) -> int:
+        """Number of batches evaluated since the server started."""
+        return sum(batcher.batch_count for batcher in self._batchers.values())
+
+    async def start_unix(self, path: str) -> None:
+        """Start listening on the Unix socket at `path`."""
+        self._server = await asyncio.start_unix_server(
+            self._handle_client, path=path, limit=STREAM_LIMIT
+        )
+
+    async def start_tcp(
+        self, host: str = "127.0.0.1", port: int = 0
+    ) -> Tuple[str, int]:
+        """
+        Start listening on a TCP port.
+
+        Returns: the (host, port) the server is bound to, useful when passing port 0 to let the system pick one
+        """
+        self._server = await asyncio.start_server(
+            self._handle_client, host=host, port=port, limit=STREAM_LIMIT
+        )
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            raise ValueError("EvaluationServer must be started before serving")
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for batcher in self._batchers.values():
+            batcher.close()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # Each request is handled in its own task so that the requests pipelined on a connection can be
+                # batched together.
+                task = asyncio.create_task(self._respond(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request should be a JSON object")
+            request_id = request.get("id")
+            response = {"id": request_id, "result": await self._dispatch(request)}
+        except Exception as e:
+            # Any failure is reported to the sender, a request left without response would hang its client
+            response = {"id": request_id, "error": str(e)}
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    async def _dispatch(self, request: Dict[str, Any]) -> Any:
+        name = request["function"]
+        if name not in self.functions:
+            raise ValueError(f"Unknown function {name}")
+        fn = self.functions[name]
+        op = request["op"]
+        if op == "evaluate":
+            if name not in self._batchers:
+                self._batchers[name] = _Batcher(
+                    fn, self.max_batch_size, self.max_latency
+                )
+            xs = request["x"]
+            if type(xs) != list or any(type(x) not in (float, int) for x in xs):
+                raise ValueError("Evaluate expects x to be a list of numbers")
+            return await self._batchers[name].submit(xs)
+        if op in ("minimum", "maximum"):
+            # Functions are immutable once loaded, their extrema are computed once
+            if (name, op) not in self._extrema:
+                self._extrema[(name, op)] = getattr(fn, op)()
+            return self._extrema[(name, op)]
+        if op == "integrate":
+            return fn.integrate(request["x_min"], request["x_max"])
+        raise ValueError(f"Unknown operation {op}")
+
+
+class EvaluationClient:
+    """
+    Client of an EvaluationServer.
+
+    Requests can be issued concurrently from several coroutines, they are pipelined over a single connection.
+    """
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._listener = asyncio.create_task(self._listen())
+
+    @classmethod
+    async def connect(cls, address: Address) -> "EvaluationClient":
+        """
+        Args:
+            address: the path of a Unix socket or a (host, port) pair
+        """
+        if isinstance(address, str):
+            reader, writer = await asyncio.open_unix_connection(
+                address, limit=STREAM_LIMIT
+            )
+        else:
+            host, port = address
+            reader, writer = await asyncio.open_connection(
+                host, port, limit=STREAM_LIMIT
+            )
+        return cls(reader, writer)
+
+    async def evaluate(self, function: str, xs: List[float]) -> List[float]:
+        return await self._request({"op": "evaluate", "function": function, "x": xs})
+
+    async def minimum(self, function: str) -> Tuple[float, float]:
+        return tuple(await self._request({"op": "minimum", "function": function}))
+
+    async def maximum(self, function: str) -> Tuple[float, float]:
+        return tuple(await self._request({"op": "maximum", "function": function}))
+
+    async def integrate(self, function: str, x_min: float, x_max: float) -> float:
+        return await self._request(
+            {"op": "integrate", "function": function, "x_min": x_min, "x_max": x_max}
+        )
+
+    async def close(self) -> None:
+        self._listener.cancel()
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def _request(self, request: Dict[str, Any]) -> Any:
+        """
+        Raises: ValueError if the server reports an error for this request
+        """
+        request_id = self._next_id
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(json.dumps({"id": request_id, **request}).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def _listen(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(ValueError(response["error"]))
+                else:
+                    future.set_result(response["result"])
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection closed"))
+            self._pending.clear()
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    index = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def benchmark(
+    address: Address,
+    function: str,
+    x_min: float,
+    x_max: float,
+    n_clients: int = 32,
+    n_requests: int = 200,
+    points_per_request: int = 8,
+) -> Dict[str, float]:
+    """
+    Generate load against a running EvaluationServer.
+
+    Each of the `n_clients` clients sends `n_requests` evaluate requests of `points_per_request` random points drawn
+    in [x_min, x_max), waiting for each response before sending the next request.
+
+    Returns: a dictionary with the number of `requests`, the `throughput` in requests per second and the `p50` and
+    `p99` latencies in seconds
+    """
+    latencies: List[float] = []
+
+    async def run_client() -> None:
+        client = await EvaluationClient.connect(address)
+        try:
+            for _ in range(n_requests):
+                xs = [random.uniform(x_min, x_max) for _ in range(points_per_request)]
+                start_time = time.perf_counter()
+                await client.evaluate(function, xs)
+                latencies.append(time.perf_counter() - start_time)
+        finally:
+            await client.close()
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(run_client() for _ in range(n_clients)))
+    elapsed = time.perf_counter() - start_time
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "p50": _percentile(latencies, 0.5),
+        "p99": _percentile(latencies, 0.99),
+    }
+
+
+async def _run_benchmark(args: argparse.Namespace) -> None:
+    breakpoints = sorted(random.uniform(-1e6, 1e6) for _ in range(args.breakpoints))
+    breakpoints = [-math.inf] + breakpoints + [math.inf]
+    slopes = [random.uniform(-10, 10) for _ in range(len(breakpoints) - 1)]
+    intercepts = [random.uniform(-10, 10) for _ in range(len(breakpoints) - 1)]
+    fn = PiecewiseLinearFunction(breakpoints, slopes, intercepts)
+
+    server = EvaluationServer(
+        {"bench": fn}, max_batch_size=args.max_batch_size, max_latency=args.max_latency
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        if args.tcp:
+            address = await server.start_tcp()
+        else:
+            address = os.path.join(directory, "piecewise.sock")
+            await server.start_unix(address)
+        try:
+            report = await benchmark(
+                address,
+                "bench",
+                -1e6,
+                1e6,
+                n_clients=args.clients,
+                n_requests=args.requests,
+                points_per_request=args.points,
+            )
+        finally:
+            await server.close()
+    print(
+        f"{report['requests']} requests in {server.batch_count} batches - "
+        f"throughput: {report['throughput']:.0f} req/s - "
+        f"p50: {report['p50'] * 1e3:.2f} ms - p99: {report['p99'] * 1e3:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--breakpoints", type=int, default=100000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--points", type=int, default=8)
+    parser.add_argument("--max-batch-size", type=int, default=4096)
+    parser.add_argument("--max-latency", type=float, default=0.001)
+    parser.add_argument(
+        "--tcp", action="store_true", help="use localhost TCP instead of a Unix socket"
+    )
+    asyncio.run(_run_benchmark(parser.parse_args()))
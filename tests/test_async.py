@@ -0,0 +1,84 @@
+import asyncio
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from PiecewiseFunctions.PiecewiseConstantFunction import PiecewiseConstantFunction
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+
+
+class TestAsyncEvaluation:
+    num_points = 1000
+    breakpoints = (
+        [-math.inf]
+        + sorted([random.uniform(-1e6, 1e6) for _ in range(num_points)])
+        + [math.inf]
+    )
+    pcf = PiecewiseConstantFunction(
+        breakpoints, [random.uniform(-1e6, 1e6) for _ in range(num_points + 1)]
+    )
+    plf = PiecewiseLinearFunction(
+        breakpoints,
+        [random.uniform(-1e3, 1e3) for _ in range(num_points + 1)],
+        [random.uniform(-1e6, 1e6) for _ in range(num_points + 1)],
+    )
+    xs = [random.uniform(-1e6, 1e6) for _ in range(2500)]
+
+    def test_aevaluate_many_inline(self):
+        for fn in (self.pcf, self.plf):
+            assert asyncio.run(fn.aevaluate_many(self.xs)) == fn.evaluate_many(self.xs)
+
+    def test_aevaluate_many_chunked(self):
+        for fn in (self.pcf, self.plf):
+            evaluations = asyncio.run(fn.aevaluate_many(self.xs, chunk_size=100))
+            assert evaluations == fn.evaluate_many(self.xs)
+
+    def test_aevaluate_many_executor(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            evaluations = asyncio.run(
+                self.plf.aevaluate_many(self.xs, chunk_size=100, executor=executor)
+            )
+        assert evaluations == self.plf.evaluate_many(self.xs)
+
+    def test_aevaluate_many_out_of_bounds(self):
+        with pytest.raises(ValueError):
+            asyncio.run(self.pcf.aevaluate_many(self.xs + [math.inf], chunk_size=100))
+
+    def test_aminimum_amaximum(self):
+        for fn in (self.pcf, self.plf):
+            for chunk_size in (7, 10000):
+                assert asyncio.run(fn.aminimum(chunk_size=chunk_size)) == fn.minimum()
+                assert asyncio.run(fn.amaximum(chunk_size=chunk_size)) == fn.maximum()
+
+    def test_ties_resolved_leftmost(self):
+        pcf = PiecewiseConstantFunction([0, 1, 2, 3, 4], [1, 0, 0, 1])
+        assert asyncio.run(pcf.aminimum(chunk_size=1)) == pcf.minimum() == (0, 1)
+
+    def test_does_not_block_event_loop(self):
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.create_task(ticker())
+            await self.plf.aevaluate_many(self.xs, chunk_size=100)
+            task.cancel()
+            return ticks
+
+        assert asyncio.run(scenario()) >= len(self.xs) // 100 - 1
+
+    def test_cancellation(self):
+        async def scenario():
+            task = asyncio.create_task(self.plf.aevaluate_many(self.xs, chunk_size=10))
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(scenario())
@@ -0,0 +1,108 @@
+import math
+import random
+
+import pytest
+
+from PiecewiseFunctions.PiecewiseConstantFunction import PiecewiseConstantFunction
+from PiecewiseFunctions.PiecewiseFunctionBuilder import PiecewiseFunctionBuilder
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+
+
+class TestBuilder:
+    def test_constant_segments_and_chunks(self):
+        builder = PiecewiseFunctionBuilder(PiecewiseConstantFunction)
+        builder.append(-math.inf, 0, 1)
+        builder.extend([0, 1, 2.5], [2, 3])
+        builder.append(2.5, math.inf, -1)
+        fn = builder.finish()
+        assert isinstance(fn, PiecewiseConstantFunction)
+        assert fn.breakpoints == [-math.inf, 0, 1, 2.5, math.inf]
+        assert fn.values == [1, 2, 3, -1]
+
+    def test_linear_segments(self):
+        builder = PiecewiseFunctionBuilder()
+        builder.append(-10, 0, 5, 9)
+        builder.append(0, 10, 4, -12)
+        fn = builder.finish()
+        assert isinstance(fn, PiecewiseLinearFunction)
+        assert fn.evaluate_many([-10, 0, 5]) == [-41, -12, 8]
+
+    def test_spill_to_temporary_files(self):
+        breakpoints = sorted(random.sample(range(-(10**6), 10**6), 10001))
+        slopes = [random.uniform(-10, 10) for _ in range(10000)]
+        intercepts = [random.uniform(-10, 10) for _ in range(10000)]
+        builder = PiecewiseFunctionBuilder(memory_budget=4096)
+        for start in range(0, 10000, 300):
+            stop = min(start + 300, 10000)
+            builder.extend(
+                breakpoints[start : stop + 1],
+                slopes[start:stop],
+                intercepts[start:stop],
+            )
+        fn = builder.finish()
+        assert fn.breakpoints == breakpoints
+        assert fn.slopes == slopes
+        assert fn.intercepts == intercepts
+
+    def test_non_contiguous_segments(self):
+        builder = PiecewiseFunctionBuilder(PiecewiseConstantFunction)
+        builder.append(0, 1, 1)
+        with pytest.raises(ValueError):
+            builder.append(2, 3, 1)
+
+    def test_unsorted_breakpoints(self):
+        builder = PiecewiseFunctionBuilder(PiecewiseConstantFunction)
+        with pytest.raises(ValueError):
+            builder.extend([0, 2, 1], [1, 2])
+        with pytest.raises(ValueError):
+            builder.extend([0, 0], [1])
+
+    def test_breakpoints_not_unique_as_floats(self):
+        builder = PiecewiseFunctionBuilder(PiecewiseConstantFunction)
+        with pytest.raises(ValueError):
+            builder.extend([0, 2**53, 2**53 + 1], [1, 2])
+
+    def test_overflowing_numbers(self):
+        builder = PiecewiseFunctionBuilder(PiecewiseConstantFunction)
+        with pytest.raises(ValueError):
+            builder.append(0, 1, 10**400)
+        with pytest.raises(ValueError):
+            builder.append(0, 10**400, 1)
+        builder.append(0, 1, 2)
+        fn = builder.finish()
+        assert fn.breakpoints == [0, 1]
+        assert fn.values == [2]
+
+    def test_invalid_coefficients(self):
+        builder = PiecewiseFunctionBuilder()
+        with pytest.raises(ValueError):
+            builder.append(0, 1, 1)
+        with pytest.raises(ValueError):
+            builder.append(0, 1, "one", 2)
+        with pytest.raises(ValueError):
+            builder.extend([0, 1, 2], [1, 2], [3])
+
+    def test_failed_chunk_is_not_appended(self):
+        builder = PiecewiseFunctionBuilder(PiecewiseConstantFunction)
+        builder.append(0, 1, 1)
+        with pytest.raises(ValueError):
+            builder.extend([1, 2, 2], [1, 2])
+        builder.append(1, 2, 5)
+        assert builder.finish().values == [1, 5]
+
+    def test_finish(self):
+        builder = PiecewiseFunctionBuilder(PiecewiseConstantFunction)
+        with pytest.raises(ValueError):
+            builder.finish()
+        builder.append(0, 1, 1)
+        builder.finish()
+        with pytest.raises(ValueError):
+            builder.finish()
+        with pytest.raises(ValueError):
+            builder.append(1, 2, 1)
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            PiecewiseFunctionBuilder(dict)
+        with pytest.raises(ValueError):
+            PiecewiseFunctionBuilder(memory_budget=0)
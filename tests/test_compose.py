@@ -0,0 +1,59 @@
+import math
+import random
+
+import pytest
+
+from PiecewiseFunctions.PiecewiseConstantFunction import PiecewiseConstantFunction
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+from PiecewiseFunctions.operations import compose
+
+
+class TestCompose:
+    # Price of load: 1 below 10, 3 up to 20, 7 beyond
+    tariff = PiecewiseConstantFunction([-math.inf, 10, 20, math.inf], [1, 3, 7])
+    # Load curve: rises from 0 to 30 over [0, 10] then decreases back to 5 over [10, 15]
+    load = PiecewiseLinearFunction([0, 10, 15], [3, -5], [0, 80])
+    quadratic_cost = PiecewiseLinearFunction(
+        [-math.inf, 0, 15, math.inf], [0, 2, 4], [0, 0, -30]
+    )
+
+    def test_constant_of_linear(self):
+        price = compose(self.tariff, self.load)
+        assert isinstance(price, PiecewiseConstantFunction)
+        assert price.breakpoints == [0, 10 / 3, 20 / 3, 12, 14, 15]
+        assert price.values == [1, 3, 7, 3, 1]
+
+    def test_linear_of_linear(self):
+        cost = compose(self.quadratic_cost, self.load)
+        assert isinstance(cost, PiecewiseLinearFunction)
+        for x in [0, 1, 4.9, 5, 7.5, 10, 11, 13, 14.99]:
+            expected = self.quadratic_cost.evaluate(self.load.evaluate(x))
+            assert cost.evaluate(x) == pytest.approx(expected)
+
+    def test_linear_of_constant(self):
+        composed = compose(self.quadratic_cost, self.tariff)
+        assert isinstance(composed, PiecewiseConstantFunction)
+        assert composed.evaluate_many([0, 15, 25]) == [2, 6, 14]
+
+    def test_random_functions(self):
+        f_breakpoints = sorted(random.uniform(-1e3, 1e3) for _ in range(200))
+        f = PiecewiseLinearFunction(
+            [-math.inf] + f_breakpoints + [math.inf],
+            [random.uniform(-5, 5) for _ in range(201)],
+            [random.uniform(-5, 5) for _ in range(201)],
+        )
+        g_breakpoints = sorted(random.uniform(-10, 10) for _ in range(51))
+        g = PiecewiseLinearFunction(
+            g_breakpoints,
+            [random.uniform(-100, 100) for _ in range(50)],
+            [random.uniform(-100, 100) for _ in range(50)],
+        )
+        composed = compose(f, g)
+        xs = [random.uniform(g_breakpoints[0], g_breakpoints[-1]) for _ in range(1000)]
+        expected = f.evaluate_many(g.evaluate_many(xs))
+        assert composed.evaluate_many(xs) == pytest.approx(expected, rel=1e-6, abs=1e-6)
+
+    def test_out_of_domain(self):
+        bounded = PiecewiseConstantFunction([0, 10], [1])
+        with pytest.raises(ValueError):
+            compose(bounded, self.load)
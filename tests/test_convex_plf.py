@@ -0,0 +1,113 @@
+import math
+import random
+import time
+
+import pytest
+
+from PiecewiseFunctions.ConvexPiecewiseLinearFunction import (
+    ConvexPiecewiseLinearFunction,
+)
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+
+
+def random_convex(num_pieces, x_min, x_max):
+    breakpoints = sorted(random.sample(range(x_min, x_max), num_pieces + 1))
+    slopes = sorted(random.uniform(-100, 100) for _ in range(num_pieces))
+    intercepts = [random.uniform(-100, 100)]
+    for i in range(1, num_pieces):
+        x = breakpoints[i]
+        intercepts.append((slopes[i - 1] - slopes[i]) * x + intercepts[i - 1])
+    return ConvexPiecewiseLinearFunction(breakpoints, slopes, intercepts)
+
+
+def value(fn, x):
+    """Evaluate fn over its closed domain of definition"""
+    if x == fn.breakpoints[-1]:
+        return fn.slopes[-1] * x + fn.intercepts[-1]
+    return fn.evaluate(x)
+
+
+class TestConvexPLF:
+    # |x - 2| over [0, 4]
+    absolute = ConvexPiecewiseLinearFunction([0, 2, 4], [-1, 1], [2, -2])
+    # max(0, 2x - 2) over [0, 3]
+    hinge = ConvexPiecewiseLinearFunction([0, 1, 3], [0, 2], [0, -2])
+
+    def test_is_convex(self):
+        assert self.absolute.is_convex()
+        assert not PiecewiseLinearFunction([0, 2, 4], [1, -1], [0, 4]).is_convex()
+        # Discontinuous
+        assert not PiecewiseLinearFunction([0, 2, 4], [-1, 1], [2, 0]).is_convex()
+
+    def test_not_convex(self):
+        with pytest.raises(ValueError):
+            ConvexPiecewiseLinearFunction([0, 2, 4], [1, -1], [0, 4])
+
+    def test_min_max(self):
+        assert self.absolute.minimum() == (0, 2)
+        assert self.absolute.maximum() == (2, 0)
+        assert self.hinge.minimum() == (0, 0)
+        assert self.hinge.maximum() == (4, 3)
+
+    def test_min_max_match_linear(self):
+        fn = random_convex(500, -10000, 10000)
+        plf = PiecewiseLinearFunction(fn.breakpoints, fn.slopes, fn.intercepts)
+        assert fn.minimum()[1] == plf.minimum()[1]
+        assert fn.minimum()[0] == pytest.approx(plf.minimum()[0])
+        assert fn.maximum() == plf.maximum()
+
+    def test_conjugate(self):
+        conjugate = self.absolute.conjugate()
+        # sup over [0, 4] of s x - |x - 2|
+        for s in [-3, -1, 0, 0.5, 1, 2.5]:
+            expected = max(s * x - value(self.absolute, x) for x in [0, 2, 4])
+            assert conjugate.evaluate(s) == pytest.approx(expected)
+
+    def test_conjugate_unbounded_domain(self):
+        # x^2 like curve over the real line: slopes -1, 0, 1
+        fn = ConvexPiecewiseLinearFunction(
+            [-math.inf, -1, 1, math.inf], [-1, 0, 1], [0, 1, 0]
+        )
+        conjugate = fn.conjugate()
+        assert conjugate.breakpoints == [-1, 0, 1]
+        assert conjugate.evaluate(-0.5) == pytest.approx(-0.5 * -1 - 1)
+
+    def test_biconjugate(self):
+        fn = random_convex(100, -1000, 1000)
+        biconjugate = fn.conjugate().conjugate()
+        assert biconjugate.breakpoints == fn.breakpoints
+        assert biconjugate.slopes == fn.slopes
+        assert biconjugate.intercepts == pytest.approx(fn.intercepts, abs=1e-6)
+
+    def test_infimal_convolution(self):
+        f = random_convex(20, -50, 50)
+        g = random_convex(30, -50, 50)
+        convolution = f.infimal_convolution(g)
+        assert convolution.breakpoints[0] == f.breakpoints[0] + g.breakpoints[0]
+        assert convolution.breakpoints[-1] == f.breakpoints[-1] + g.breakpoints[-1]
+        for _ in range(100):
+            z = random.uniform(convolution.breakpoints[0], convolution.breakpoints[-1])
+            # The infimum is reached at a breakpoint of f or of g
+            candidates = f.breakpoints + [z - y for y in g.breakpoints]
+            expected = min(
+                value(f, x) + value(g, z - x)
+                for x in candidates
+                if f.breakpoints[0] <= x <= f.breakpoints[-1]
+                and g.breakpoints[0] <= z - x <= g.breakpoints[-1]
+            )
+            assert convolution.evaluate(z) == pytest.approx(expected, abs=1e-6)
+
+    def test_infimal_convolution_unbounded_below(self):
+        decreasing = ConvexPiecewiseLinearFunction([0, math.inf], [-1], [0])
+        increasing = ConvexPiecewiseLinearFunction([-math.inf, 0], [1], [0])
+        with pytest.raises(ValueError):
+            decreasing.infimal_convolution(increasing)
+
+    def test_infimal_convolution_large_input(self):
+        f = random_convex(100000, -(10**7), 10**7)
+        g = random_convex(100000, -(10**7), 10**7)
+        start_time = time.time()
+        convolution = f.infimal_convolution(g)
+        end_time = time.time()
+        assert len(convolution.slopes) <= 200000
+        assert end_time - start_time < 2.0
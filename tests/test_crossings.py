@@ -0,0 +1,89 @@
+import math
+import random
+
+import pytest
+
+from PiecewiseFunctions.PiecewiseConstantFunction import PiecewiseConstantFunction
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+from PiecewiseFunctions.operations import crossings, batch_crossings
+
+
+class TestCrossings:
+    # Flat tariff against a tariff with a subscription fee and a lower unit price
+    flat = PiecewiseLinearFunction([0, math.inf], [2], [0])
+    subscription = PiecewiseLinearFunction([0, math.inf], [1], [10])
+    threshold = PiecewiseLinearFunction([-10, 10], [1], [0])
+    steps = PiecewiseConstantFunction([-10, -5, 5, 10], [-7, 0, 7])
+
+    def test_break_even(self):
+        points, on_top = crossings(self.flat, self.subscription)
+        assert points == [10]
+        assert on_top.breakpoints == [0, 10, math.inf]
+        assert on_top.values == [-1, 1]
+
+    def test_jump_past_threshold(self):
+        points, on_top = crossings(self.steps, self.threshold)
+        # Below x until -5, jumps above it, crosses it at 0, jumps above at 5 and is crossed again at 7
+        assert points == [-7, -5, 0, 5, 7]
+        assert on_top.values == [1, -1, 1, -1, 1, -1]
+
+    def test_equal_region(self):
+        f = PiecewiseLinearFunction([0, 1, 2, 3], [0, 0, 0], [0, 1, 2])
+        g = PiecewiseConstantFunction([0, 3], [1])
+        points, on_top = crossings(f, g)
+        assert points == [1, 2]
+        assert on_top.values == [-1, 0, 1]
+
+    def test_no_overlap(self):
+        with pytest.raises(ValueError):
+            crossings(self.flat, PiecewiseConstantFunction([-2, -1], [0]))
+
+    def test_random_functions(self):
+        f = PiecewiseLinearFunction(
+            sorted(random.sample(range(-1000, 1000), 101)),
+            [random.uniform(-1, 1) for _ in range(100)],
+            [random.uniform(-100, 100) for _ in range(100)],
+        )
+        g = PiecewiseConstantFunction(
+            sorted(random.sample(range(-1000, 1000), 51)),
+            [random.uniform(-100, 100) for _ in range(50)],
+        )
+        _, on_top = crossings(f, g)
+        start, end = on_top.breakpoints[0], on_top.breakpoints[-1]
+        for _ in range(1000):
+            x = random.uniform(start, end)
+            difference = f.evaluate(x) - g.evaluate(x)
+            if abs(difference) > 1e-9:
+                assert on_top.evaluate(x) == (1 if difference > 0 else -1)
+
+    def test_batch_crossings(self):
+        results = batch_crossings(self.threshold, [self.steps, self.flat])
+        assert results[0][0] == crossings(self.threshold, self.steps)[0]
+        assert results[1][1].values == crossings(self.threshold, self.flat)[1].values
+
+    def test_batch_crossings_match_crossings(self):
+        f = PiecewiseLinearFunction(
+            [-math.inf] + sorted(random.sample(range(-100, 100), 20)) + [math.inf],
+            [0]
+            + [random.choice([0, 1, random.uniform(-1, 1)]) for _ in range(19)]
+            + [0],
+            [random.randint(-10, 10) for _ in range(21)],
+        )
+        others = [self.steps, self.threshold, self.flat, self.subscription]
+        for _ in range(20):
+            n = random.randint(1, 30)
+            others.append(
+                PiecewiseConstantFunction(
+                    sorted(random.sample(range(-100, 100), n + 1)),
+                    [random.randint(-10, 10) for _ in range(n)],
+                )
+            )
+        for (points, on_top), g in zip(batch_crossings(f, others), others):
+            expected_points, expected_on_top = crossings(f, g)
+            assert points == expected_points
+            assert on_top.breakpoints == expected_on_top.breakpoints
+            assert on_top.values == expected_on_top.values
+
+    def test_batch_crossings_no_overlap(self):
+        with pytest.raises(ValueError):
+            batch_crossings(self.flat, [PiecewiseConstantFunction([-2, -1], [0])])
@@ -0,0 +1,60 @@
+import math
+import random
+import time
+
+import pytest
+
+from PiecewiseFunctions.PiecewiseConstantFunction import PiecewiseConstantFunction
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+
+
+class TestGradient:
+    breakpoints = [-math.inf, 0, 10, 30, math.inf]
+    plf = PiecewiseLinearFunction(breakpoints, [2, 3, 7, -3], [3, 3, -37, 173])
+    pcf = PiecewiseConstantFunction(breakpoints, [1, 2, 2, 0])
+    xs = [-5, 0, 5, 10, 30, 100]
+
+    def test_plf_values_and_indices(self):
+        values, gradients, indices = self.plf.evaluate_with_gradient(self.xs)
+        assert values.tolist() == self.plf.evaluate_many(self.xs)
+        assert gradients.tolist() == [2, 3, 3, 7, -3, -3]
+        assert indices.tolist() == [0, 1, 1, 2, 3, 3]
+
+    def test_plf_left_gradient(self):
+        _, gradients, _ = self.plf.evaluate_with_gradient(self.xs, side="left")
+        assert gradients.tolist() == [2, 2, 3, 3, 7, -3]
+
+    def test_plf_interval_gradient(self):
+        _, gradients, _ = self.plf.evaluate_with_gradient(self.xs, side="interval")
+        assert gradients.shape == (len(self.xs), 2)
+        assert gradients.tolist() == [[2, 2], [2, 3], [3, 3], [3, 7], [-3, 7], [-3, -3]]
+
+    def test_plf_domain_start(self):
+        plf = PiecewiseLinearFunction([0, 1], [4], [0])
+        _, gradients, _ = plf.evaluate_with_gradient([0], side="left")
+        assert gradients.tolist() == [4]
+
+    def test_pcf(self):
+        values, gradients, indices = self.pcf.evaluate_with_gradient(self.xs)
+        assert values.tolist() == self.pcf.evaluate_many(self.xs)
+        assert gradients.tolist() == [0] * len(self.xs)
+        assert indices.tolist() == [0, 1, 1, 2, 3, 3]
+        _, gradients, _ = self.pcf.evaluate_with_gradient(self.xs, side="interval")
+        assert gradients.shape == (len(self.xs), 2)
+        assert self.pcf.jumps() == [0, 30]
+
+    def test_invalid_inputs(self):
+        with pytest.raises(ValueError):
+            self.plf.evaluate_with_gradient([0], side="middle")
+        with pytest.raises(ValueError):
+            self.pcf.evaluate_with_gradient([math.inf])
+
+    def test_large_input(self):
+        xs = [random.uniform(-100, 100) for _ in range(10**6)]
+
+        start_time = time.time()
+        values, _, _ = self.plf.evaluate_with_gradient(xs, side="interval")
+        end_time = time.time()
+
+        assert len(values) == len(xs)
+        assert end_time - start_time < 1.0
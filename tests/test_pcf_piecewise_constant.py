@@ -1,3 +1,4 @@
+import pytest
 from PiecewiseFunctions.PiecewiseConstantFunction import PiecewiseConstantFunction
 import math
 
@@ -53,3 +54,28 @@ class TestPiecewiseConstant:
         max_val, arg_max = self.piecewise_constant.maximum()
         assert max_val == 1
         assert -1 <= arg_max <= 1
+
+    def test_evaluate_many(self):
+        xs = [-10, -1, -0.5, 0.5, 1, 3]
+        evaluations = self.piecewise_constant.evaluate_many(xs)
+        assert evaluations == [self.piecewise_constant.evaluate(x) for x in xs]
+
+    def test_evaluate_many_out_of_bounds(self):
+        with pytest.raises(ValueError):
+            self.piecewise_constant.evaluate_many([0, math.inf])
+
+    def test_integrate(self):
+        assert self.piecewise_constant.integrate(-3, 2) == 0 * 2 + 1 * 2 - 1 * 1
+        assert self.piecewise_constant.integrate(-0.5, 0.5) == 1
+        assert self.piecewise_constant.integrate(4, 4) == 0
+
+    def test_integrate_reversed_bounds(self):
+        with pytest.raises(ValueError):
+            self.piecewise_constant.integrate(1, -1)
+
+    def test_evaluate_many_large_batch(self):
+        xs = [x / 10 for x in range(-1000, 1000)]
+        evaluations = self.piecewise_constant.evaluate_many(xs)
+        assert evaluations == [self.piecewise_constant.evaluate(x) for x in xs]
+        with pytest.raises(ValueError):
+            self.piecewise_constant.evaluate_many(xs + [math.nan])
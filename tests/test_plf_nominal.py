@@ -1,3 +1,4 @@
+import pytest
 from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
 import math
 
@@ -15,3 +16,30 @@ class TestNominalPLF:
     def test_evaluate_border(self):
         evaluation = self.plf.evaluate(0)
         assert evaluation == 3 * (0) + 12
+
+    def test_evaluate_many(self):
+        xs = [-10, 0, 5, 10, 42.5, 70, 1e6]
+        evaluations = self.plf.evaluate_many(xs)
+        assert evaluations == [self.plf.evaluate(x) for x in xs]
+
+    def test_evaluate_many_out_of_bounds(self):
+        with pytest.raises(ValueError):
+            self.plf.evaluate_many([0, math.inf])
+
+    def test_integrate(self):
+        # 3x + 12 on [0, 10] then 7x - 2 on [10, 20]
+        expected = (3 * 100 / 2 + 12 * 10) + (7 * (400 - 100) / 2 - 2 * 10)
+        assert self.plf.integrate(0, 20) == expected
+        assert self.plf.integrate(5, 5) == 0
+
+    def test_integrate_out_of_bounds(self):
+        plf = PiecewiseLinearFunction([0, 1], [1], [0])
+        with pytest.raises(ValueError):
+            plf.integrate(-1, 1)
+
+    def test_evaluate_many_large_batch(self):
+        xs = [x / 10 for x in range(-1000, 1000)]
+        evaluations = self.plf.evaluate_many(xs)
+        assert evaluations == pytest.approx([self.plf.evaluate(x) for x in xs])
+        with pytest.raises(ValueError):
+            self.plf.evaluate_many(xs + [math.inf])
@@ -0,0 +1,137 @@
+import math
+import random
+
+import pytest
+
+from PiecewiseFunctions.PiecewiseConstantFunction import PiecewiseConstantFunction
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+
+
+def window_samples(fn, x, width, num_points=200):
+    """Values of fn sampled over [x - width, x]"""
+    samples = [x - width + width * p / num_points for p in range(num_points + 1)]
+    return fn.evaluate_many(samples)
+
+
+def continuous_plf(breakpoints, ys):
+    """Continuous piecewise linear function through the points (breakpoints, ys)"""
+    slopes = [
+        (ys[i + 1] - ys[i]) / (breakpoints[i + 1] - breakpoints[i])
+        for i in range(len(ys) - 1)
+    ]
+    intercepts = [ys[i] - slopes[i] * breakpoints[i] for i in range(len(slopes))]
+    return PiecewiseLinearFunction(breakpoints, slopes, intercepts)
+
+
+def window_extrema(fn, x, width):
+    """Exact extrema of a continuous fn over [x - width, x], reached at the ends of the window or at a breakpoint"""
+    candidates = [fn.evaluate(x - width), fn.evaluate(x)] + [
+        fn.evaluate(b) for b in fn.breakpoints if x - width < b < x
+    ]
+    return max(candidates), min(candidates)
+
+
+class TestRolling:
+    pcf = PiecewiseConstantFunction([0, 1, 2, 4, 5, 10], [3, 1, 2, 5, 0])
+    # Tent: rises from 0 to 10 over [0, 10], decreases back over [10, 20]
+    tent = PiecewiseLinearFunction([0, 10, 20], [1, -1], [0, 20])
+
+    def test_pcf_rolling_max(self):
+        rolling = self.pcf.rolling_max(1.5)
+        assert rolling.breakpoints == [1.5, 2.5, 4, 6.5, 10]
+        assert rolling.values == [3, 2, 5, 0]
+
+    def test_pcf_rolling_min(self):
+        rolling = self.pcf.rolling_min(1.5)
+        assert rolling.breakpoints == [1.5, 3.5, 5, 10]
+        assert rolling.values == [1, 2, 0]
+
+    def test_pcf_rolling_mean(self):
+        rolling = self.pcf.rolling_mean(2)
+        for x in [2, 2.5, 3, 4.5, 6, 7.9]:
+            assert rolling.evaluate(x) == pytest.approx(
+                self.pcf.integrate(x - 2, x) / 2
+            )
+
+    def test_plf_rolling_max(self):
+        rolling = self.tent.rolling_max(4)
+        for x, expected in [(4, 4), (10, 10), (12, 10), (14, 10), (16, 8), (19, 5)]:
+            assert rolling.evaluate(x) == pytest.approx(expected)
+
+    def test_plf_rolling_min(self):
+        rolling = self.tent.rolling_min(4)
+        for x, expected in [(4, 0), (10, 6), (12, 8), (14, 6), (15, 5), (19, 1)]:
+            assert rolling.evaluate(x) == pytest.approx(expected)
+
+    def test_plf_rolling_mean(self):
+        rolling = self.tent.rolling_mean(4)
+        # Exact where the window lies on a single piece or at the breakpoints of the result
+        for x in [4, 7, 10, 14, 17, 19.5]:
+            assert rolling.evaluate(x) == pytest.approx(
+                self.tent.integrate(x - 4, x) / 4
+            )
+
+    def test_infinite_domain(self):
+        heaviside = PiecewiseConstantFunction([-math.inf, 0, math.inf], [0, 1])
+        rolling = heaviside.rolling_min(3)
+        assert rolling.breakpoints == [-math.inf, 3, math.inf]
+        assert rolling.values == [0, 1]
+        assert heaviside.rolling_mean(2).evaluate(1) == 0.5
+
+    def test_random_functions(self):
+        width = 37.5
+        breakpoints = sorted(random.sample(range(-1000, 1000), 101))
+        pcf = PiecewiseConstantFunction(
+            breakpoints, [random.uniform(-10, 10) for _ in range(100)]
+        )
+        plf = PiecewiseLinearFunction(
+            breakpoints,
+            [random.uniform(-1, 1) for _ in range(100)],
+            [random.uniform(-10, 10) for _ in range(100)],
+        )
+        rolling = {
+            fn: (fn.rolling_max(width), fn.rolling_min(width)) for fn in (pcf, plf)
+        }
+        for _ in range(100):
+            x = random.uniform(breakpoints[0] + width, breakpoints[-1] - 1e-6)
+            for fn, (rolling_max, rolling_min) in rolling.items():
+                samples = window_samples(fn, x, width)
+                # Samples may miss the extremum by a fraction of the sampling step
+                assert rolling_max.evaluate(x) >= max(samples) - 1e-9
+                assert rolling_min.evaluate(x) <= min(samples) + 1e-9
+                assert rolling_max.evaluate(x) <= max(samples) + 2 * width / 200
+                assert rolling_min.evaluate(x) >= min(samples) - 2 * width / 200
+
+    def test_continuous_plf_rolling_extrema(self):
+        b = [
+            2.1801613199601877,
+            9.701054754410546,
+            12.201966224210441,
+            12.471940293277013,
+            17.929523620504757,
+            18.207919994785524,
+        ]
+        fn = continuous_plf(b, [-4.4358, 0.9480, 4.2192, -4.4564, -4.7637, 0.9613])
+        width = 6.460423987595303
+        rolling_max = fn.rolling_max(width)
+        for x in [9, 10, 11, 12, 12.2, 15, 18]:
+            assert rolling_max.evaluate(x) == pytest.approx(
+                window_extrema(fn, x, width)[0]
+            )
+
+    def test_random_continuous_functions(self):
+        for _ in range(200):
+            breakpoints = sorted(random.uniform(0, 20) for _ in range(6))
+            fn = continuous_plf(breakpoints, [random.uniform(-5, 5) for _ in range(6)])
+            width = random.uniform(0.1, 0.9) * (breakpoints[-1] - breakpoints[0])
+            rolling_max, rolling_min = fn.rolling_max(width), fn.rolling_min(width)
+            for _ in range(20):
+                x = random.uniform(breakpoints[0] + width, breakpoints[-1] - 1e-9)
+                maximum, minimum = window_extrema(fn, x, width)
+                assert rolling_max.evaluate(x) == pytest.approx(maximum, abs=1e-9)
+                assert rolling_min.evaluate(x) == pytest.approx(minimum, abs=1e-9)
+
+    def test_invalid_width(self):
+        for width in (0, -1, math.inf, 10):
+            with pytest.raises(ValueError):
+                self.pcf.rolling_max(width)
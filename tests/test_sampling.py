@@ -0,0 +1,62 @@
+import math
+import time
+
+import numpy as np
+import pytest
+
+from PiecewiseFunctions.PiecewiseConstantFunction import PiecewiseConstantFunction
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+
+
+class TestSampling:
+    # Arrival intensity: null at night, 1 in the morning and 3 in the afternoon
+    intensity = PiecewiseConstantFunction(
+        [-math.inf, 8, 12, 18, math.inf], [0, 1, 3, 0]
+    )
+    # Triangular density over [0, 2] peaking at 1
+    triangle = PiecewiseLinearFunction([0, 1, 2], [1, -1], [0, 2])
+
+    def test_constant_density(self):
+        samples = self.intensity.sample(100000, np.random.default_rng(42))
+        assert samples.shape == (100000,)
+        assert samples.min() >= 8
+        assert samples.max() < 18
+        # Mass of 4 in the morning and of 18 in the afternoon
+        assert np.mean(samples < 12) == pytest.approx(4 / 22, abs=0.01)
+        assert np.mean(samples) == pytest.approx((4 * 10 + 18 * 15) / 22, abs=0.05)
+
+    def test_linear_density(self):
+        samples = self.triangle.sample(100000, np.random.default_rng(42))
+        assert samples.min() >= 0
+        assert samples.max() <= 2
+        assert np.mean(samples) == pytest.approx(1, abs=0.01)
+        assert np.mean(samples < 0.5) == pytest.approx(0.125, abs=0.01)
+
+    def test_reproducible(self):
+        first = self.triangle.sample(10, np.random.default_rng(0))
+        second = self.triangle.sample(10, np.random.default_rng(0))
+        assert np.array_equal(first, second)
+
+    def test_negative_density(self):
+        with pytest.raises(ValueError):
+            PiecewiseConstantFunction([0, 1, 2], [1, -1]).sample(10)
+        with pytest.raises(ValueError):
+            PiecewiseLinearFunction([0, 2], [-1], [1]).sample(10)
+
+    def test_infinite_mass(self):
+        with pytest.raises(ValueError):
+            PiecewiseConstantFunction([0, math.inf], [1]).sample(10)
+
+    def test_null_mass(self):
+        with pytest.raises(ValueError):
+            PiecewiseConstantFunction([0, 1], [0]).sample(10)
+
+    def test_sample_large_input(self):
+        rng = np.random.default_rng()
+        self.intensity.sample(1, rng)
+
+        start_time = time.time()
+        self.intensity.sample(10**7, rng)
+        end_time = time.time()
+
+        assert end_time - start_time < 1.0
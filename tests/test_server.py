@@ -0,0 +1,175 @@
+import asyncio
+import json
+import math
+
+import pytest
+
+from PiecewiseFunctions.PiecewiseConstantFunction import PiecewiseConstantFunction
+from PiecewiseFunctions.PiecewiseLinearFunction import PiecewiseLinearFunction
+from PiecewiseFunctions.server import (
+    EvaluationClient,
+    EvaluationServer,
+    _Batcher,
+    benchmark,
+)
+
+
+class TestEvaluationServer:
+    pcf = PiecewiseConstantFunction([-math.inf, -1, 1, math.inf], [0, 1, -1])
+    plf = PiecewiseLinearFunction([-10, 0, 10], [5, 4], [9, -12])
+    functions = {"pcf": pcf, "plf": plf}
+
+    def test_requests_over_tcp(self):
+        async def scenario():
+            server = EvaluationServer(self.functions)
+            address = await server.start_tcp()
+            client = await EvaluationClient.connect(address)
+            try:
+                assert await client.evaluate("pcf", [-5, 0, 5]) == [0, 1, -1]
+                assert await client.minimum("plf") == self.plf.minimum()
+                assert await client.maximum("pcf") == self.pcf.maximum()
+                assert await client.integrate("plf", -10, 10) == self.plf.integrate(
+                    -10, 10
+                )
+            finally:
+                await client.close()
+                await server.close()
+
+        asyncio.run(scenario())
+
+    def test_concurrent_requests_are_batched(self, tmp_path):
+        async def scenario():
+            server = EvaluationServer(self.functions, max_latency=0.05)
+            address = str(tmp_path / "piecewise.sock")
+            await server.start_unix(address)
+            client = await EvaluationClient.connect(address)
+            try:
+                xs = [[x, x + 0.5] for x in range(-10, 9)]
+                results = await asyncio.gather(
+                    *(client.evaluate("plf", batch) for batch in xs)
+                )
+                assert results == [self.plf.evaluate_many(batch) for batch in xs]
+                assert server.batch_count < len(xs)
+            finally:
+                await client.close()
+                await server.close()
+
+        asyncio.run(scenario())
+
+    def test_out_of_bounds_request_fails_alone(self):
+        async def scenario():
+            server = EvaluationServer(self.functions, max_latency=0.05)
+            address = await server.start_tcp()
+            client = await EvaluationClient.connect(address)
+            try:
+                valid = client.evaluate("plf", [0, 1])
+                invalid = client.evaluate("plf", [100])
+                results = await asyncio.gather(valid, invalid, return_exceptions=True)
+                assert results[0] == self.plf.evaluate_many([0, 1])
+                assert isinstance(results[1], ValueError)
+                with pytest.raises(ValueError):
+                    await client.evaluate("unknown", [0])
+            finally:
+                await client.close()
+                await server.close()
+
+        asyncio.run(scenario())
+
+    def test_malformed_requests(self):
+        async def scenario():
+            server = EvaluationServer(self.functions)
+            host, port = await server.start_tcp()
+            reader, writer = await asyncio.open_connection(host, port)
+            try:
+                lines = [
+                    {"id": 1, "op": "evaluate", "function": "plf", "x": "ab"},
+                    [1, 2],
+                    {"id": 2, "op": "evaluate", "function": "plf", "x": [None]},
+                    {"id": 3, "op": "evaluate", "function": "plf", "x": [1.0]},
+                ]
+                for line in lines:
+                    writer.write(json.dumps(line).encode() + b"\n")
+                    responses = json.loads(
+                        await asyncio.wait_for(reader.readline(), timeout=1)
+                    )
+                    if line == lines[-1]:
+                        assert responses == {
+                            "id": 3,
+                            "result": [self.plf.evaluate(1.0)],
+                        }
+                    else:
+                        assert "error" in responses
+            finally:
+                writer.close()
+                await server.close()
+
+        asyncio.run(scenario())
+
+    def test_oversized_integers(self):
+        async def scenario():
+            ramp = PiecewiseLinearFunction([-math.inf, 0, math.inf], [0, 1], [0, 0])
+            server = EvaluationServer({"ramp": ramp})
+            host, port = await server.start_tcp()
+            reader, writer = await asyncio.open_connection(host, port)
+            try:
+                # An integer too large for a double, which json keeps as a Python integer
+                oversized = b"1" + b"0" * 400
+                lines = [
+                    b'{"id": 1, "op": "evaluate", "function": "ramp", "x": ['
+                    + b", ".join([oversized] * 100)
+                    + b"]}",
+                    b'{"id": 2, "op": "integrate", "function": "ramp", "x_min": 0, "x_max": '
+                    + oversized
+                    + b"}",
+                ]
+                for request_id, line in enumerate(lines, 1):
+                    writer.write(line + b"\n")
+                    response = json.loads(
+                        await asyncio.wait_for(reader.readline(), timeout=1)
+                    )
+                    assert response["id"] == request_id
+                    assert "error" in response
+            finally:
+                writer.close()
+                await server.close()
+
+        asyncio.run(scenario())
+
+    def test_batcher_survives_errors(self):
+        async def scenario():
+            batcher = _Batcher(self.plf, max_batch_size=16, max_latency=0.01)
+            try:
+                results = await asyncio.gather(
+                    batcher.submit([None]), batcher.submit([1]), return_exceptions=True
+                )
+                assert isinstance(results[0], TypeError)
+                assert results[1] == self.plf.evaluate_many([1])
+                assert await asyncio.wait_for(batcher.submit([2]), timeout=1) == (
+                    self.plf.evaluate_many([2])
+                )
+            finally:
+                batcher.close()
+
+        asyncio.run(scenario())
+
+    def test_invalid_batch_parameters(self):
+        with pytest.raises(ValueError):
+            EvaluationServer(self.functions, max_batch_size=0)
+        with pytest.raises(ValueError):
+            EvaluationServer(self.functions, max_latency=-1)
+
+    def test_benchmark(self):
+        async def scenario():
+            server = EvaluationServer(self.functions)
+            address = await server.start_tcp()
+            try:
+                return await benchmark(
+                    address, "plf", -10, 10, n_clients=4, n_requests=10
+                )
+            finally:
+                await server.close()
+
+        report = asyncio.run(scenario())
+        assert report["requests"] == 40
+        assert report["throughput"] > 0
+        assert report["p50"] <= report["p99"]